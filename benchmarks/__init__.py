@@ -0,0 +1,11 @@
+"""
+Benchmarks are run from the repository root, e.g. `python -m benchmarks.bls_backends`.
+Settings required by `src.config.settings` get placeholder values
+so the benchmarks can run without a configured `.env` file.
+"""
+import os
+
+os.environ.setdefault('NETWORK', 'hoodi')
+os.environ.setdefault('EXECUTION_ENDPOINT', 'http://127.0.0.1:8545')
+os.environ.setdefault('VALIDATORS_MANAGER_KEY_FILE', 'validators-manager-key.json')
+os.environ.setdefault('VALIDATORS_MANAGER_PASSWORD_FILE', 'validators-manager-password.txt')
@@ -0,0 +1,63 @@
+import secrets
+import time
+from typing import Callable, TypeVar
+
+import click
+from eth_typing import BLSPrivateKey
+from py_ecc.optimized_bls12_381.optimized_curve import curve_order
+
+from src.validators.bls_backends import BLS_BACKENDS, BLSBackend
+
+MESSAGE = bytes(32)
+
+T = TypeVar('T')
+
+
+@click.command(help='Compares SkToPk, Sign and Verify speed of the BLS backends.')
+@click.option('--keys', type=int, default=20, show_default=True, help='Number of keys.')
+def main(keys: int) -> None:
+    private_keys = [BLSPrivateKey(secrets.randbelow(curve_order - 1) + 1) for _ in range(keys)]
+    results: dict[str, bytes] = {}
+
+    for name, backend_class in BLS_BACKENDS.items():
+        results[name] = _run_backend(backend_class(), private_keys)
+
+    if len(set(results.values())) != 1:
+        raise click.ClickException('BLS backends produced different results')
+
+
+def _run_backend(backend: BLSBackend, private_keys: list[BLSPrivateKey]) -> bytes:
+    name, keys = backend.name, len(private_keys)
+    public_keys = _measure(name, 'sk_to_pk', keys, lambda: _sk_to_pk(backend, private_keys))
+    signatures = _measure(name, 'sign', keys, lambda: _sign(backend, private_keys))
+    _measure(name, 'verify', keys, lambda: _verify(backend, public_keys, signatures))
+    return b''.join(public_keys) + b''.join(signatures)
+
+
+def _measure(backend: str, operation: str, keys: int, fn: Callable[[], T]) -> T:
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    click.echo(
+        f'{backend:>8} {operation:>9}: {elapsed:8.3f}s total, '
+        f'{elapsed / keys * 1000:8.3f}ms per key'
+    )
+    return result
+
+
+def _sk_to_pk(backend: BLSBackend, private_keys: list[BLSPrivateKey]) -> list[bytes]:
+    return [backend.sk_to_pk(private_key) for private_key in private_keys]
+
+
+def _sign(backend: BLSBackend, private_keys: list[BLSPrivateKey]) -> list[bytes]:
+    return [backend.sign(private_key, MESSAGE) for private_key in private_keys]
+
+
+def _verify(backend: BLSBackend, public_keys: list[bytes], signatures: list[bytes]) -> None:
+    for public_key, signature in zip(public_keys, signatures):
+        if not backend.verify(public_key, MESSAGE, signature):
+            raise click.ClickException(f'{backend.name}: invalid signature')
+
+
+if __name__ == '__main__':
+    main()  # pylint: disable=no-value-for-parameter
@@ -0,0 +1,65 @@
+import asyncio
+import json
+import os
+import secrets
+import time
+from typing import Callable
+
+import click
+from web3 import Web3
+from web3.contract import AsyncContract
+
+import src.common.contracts
+from src.common.clients import get_execution_client
+from src.common.contracts import VaultContract
+
+
+@click.command(help='Measures vault contract loading under concurrent requests.')
+@click.option('--requests', type=int, default=10000, show_default=True)
+@click.option('--concurrency', type=int, default=100, show_default=True)
+@click.option('--vaults', type=int, default=50, show_default=True, help='Number of vaults.')
+def main(requests: int, concurrency: int, vaults: int) -> None:
+    addresses = [Web3.to_checksum_address(secrets.token_hex(20)) for _ in range(vaults)]
+    for name, load_contract in (
+        ('uncached', _load_contract_uncached),
+        ('cached', _load_contract_cached),
+    ):
+        elapsed = asyncio.run(_run(load_contract, addresses, requests, concurrency))
+        click.echo(f'{name:>8}: {requests / elapsed:10.1f} requests per second')
+
+
+async def _run(
+    load_contract: Callable[[str], AsyncContract],
+    addresses: list[str],
+    requests: int,
+    concurrency: int,
+) -> float:
+    queue: asyncio.Queue[str] = asyncio.Queue()
+    for i in range(requests):
+        queue.put_nowait(addresses[i % len(addresses)])
+
+    async def worker() -> None:
+        while not queue.empty():
+            address = queue.get_nowait()
+            # build the call made by /fund, /withdraw and /consolidate
+            load_contract(address).functions.validatorsManagerNonce()
+            await asyncio.sleep(0)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - start
+
+
+def _load_contract_uncached(address: str) -> AsyncContract:
+    current_dir = os.path.dirname(src.common.contracts.__file__)
+    with open(os.path.join(current_dir, VaultContract.abi_path), encoding='utf-8') as f:
+        abi = json.load(f)
+    return get_execution_client().eth.contract(abi=abi, address=Web3.to_checksum_address(address))
+
+
+def _load_contract_cached(address: str) -> AsyncContract:
+    return VaultContract(Web3.to_checksum_address(address)).contract
+
+
+if __name__ == '__main__':
+    main()  # pylint: disable=no-value-for-parameter
@@ -0,0 +1,58 @@
+import secrets
+import time
+
+import click
+from eth_typing import BLSPubkey
+from sw_utils import DepositData, get_v2_withdrawal_credentials
+from sw_utils.typings import Bytes32
+from web3 import Web3
+from web3.types import Gwei
+
+from src.validators.deposit_data import EMPTY_SIGNATURE, get_deposit_data_roots
+
+VAULT = Web3.to_checksum_address('0x' + '22' * 20)
+
+
+@click.command(help='Compares batched deposit data roots with SSZ DepositData objects.')
+@click.option('--counts', default='1000,10000', show_default=True)
+def main(counts: str) -> None:
+    for count in [int(c) for c in counts.split(',')]:
+        public_keys = [BLSPubkey(secrets.token_bytes(48)) for _ in range(count)]
+        amounts = [
+            Gwei(secrets.choice([10**9, 32 * 10**9, 2048 * 10**9])) for _ in range(count)
+        ]
+
+        start = time.perf_counter()
+        ssz_roots = _get_deposit_data_roots_ssz(public_keys, amounts)
+        ssz_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        roots = get_deposit_data_roots(
+            public_keys, get_v2_withdrawal_credentials(VAULT), amounts, EMPTY_SIGNATURE
+        )
+        elapsed = time.perf_counter() - start
+
+        if roots != ssz_roots:
+            raise click.ClickException(f'{count} deposits: roots are different')
+        click.echo(
+            f'{count:>8} deposits: ssz {ssz_elapsed * 1000:9.3f}ms, '
+            f'batched {elapsed * 1000:9.3f}ms'
+        )
+
+
+# previous implementation of /fund
+def _get_deposit_data_roots_ssz(public_keys: list[BLSPubkey], amounts: list[Gwei]) -> list[Bytes32]:
+    roots = []
+    for public_key, amount in zip(public_keys, amounts):
+        deposit_data = DepositData(
+            pubkey=public_key,
+            withdrawal_credentials=get_v2_withdrawal_credentials(VAULT),
+            amount=amount,
+            signature=EMPTY_SIGNATURE,
+        )
+        roots.append(Bytes32(deposit_data.hash_tree_root))
+    return roots
+
+
+if __name__ == '__main__':
+    main()  # pylint: disable=no-value-for-parameter
@@ -0,0 +1,78 @@
+import secrets
+import time
+
+import click
+from eth_account import Account
+from eth_account.messages import encode_typed_data
+from eth_account.signers.local import LocalAccount
+from eth_typing import ChecksumAddress, HexStr
+from web3 import Web3
+
+from src.config import settings
+from src.validators.eip712 import sign_vault_validators
+
+# fixed inputs, signatures are checked against `encode_typed_data` signing
+PRIVATE_KEY = '0x' + '11' * 32
+VAULT = Web3.to_checksum_address('0x' + '22' * 20)
+
+
+@click.command(help='Compares VaultValidators signer with encode_typed_data signing.')
+@click.option('--signatures', type=int, default=2000, show_default=True)
+@click.option('--validators-size', type=int, default=10 * 184, show_default=True)
+def main(signatures: int, validators_size: int) -> None:
+    account = Account().from_key(PRIVATE_KEY)
+    vectors = [(VAULT, bytes(32), b''), (VAULT, b'\xff' * 32, b'\x01' * 184)]
+    vectors += [
+        (
+            Web3.to_checksum_address(secrets.token_hex(20)),
+            secrets.token_bytes(32),
+            secrets.token_bytes(validators_size),
+        )
+        for _ in range(signatures)
+    ]
+
+    start = time.perf_counter()
+    expected = [_sign_typed_data(account, *vector) for vector in vectors]
+    legacy_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    results = [sign_vault_validators(account, *vector) for vector in vectors]
+    elapsed = time.perf_counter() - start
+
+    if results != expected:
+        raise click.ClickException('signatures differ from encode_typed_data signatures')
+    click.echo(f'encode_typed_data: {len(vectors) / legacy_elapsed:10.1f} signatures per second')
+    click.echo(f'      precomputed: {len(vectors) / elapsed:10.1f} signatures per second')
+
+
+def _sign_typed_data(
+    account: LocalAccount,
+    vault: ChecksumAddress,
+    validators_registry_root: bytes,
+    validators: bytes,
+) -> HexStr:
+    full_message = {
+        'primaryType': 'VaultValidators',
+        'types': {
+            'VaultValidators': [
+                {'name': 'validatorsRegistryRoot', 'type': 'bytes32'},
+                {'name': 'validators', 'type': 'bytes'},
+            ],
+        },
+        'domain': {
+            'name': 'VaultValidators',
+            'version': '1',
+            'chainId': settings.network_config.CHAIN_ID,
+            'verifyingContract': vault,
+        },
+        'message': {
+            'validatorsRegistryRoot': validators_registry_root,
+            'validators': validators,
+        },
+    }
+    encoded_message = encode_typed_data(full_message=full_message)
+    return HexStr(account.sign_message(encoded_message).signature.hex())
+
+
+if __name__ == '__main__':
+    main()  # pylint: disable=no-value-for-parameter
@@ -0,0 +1,106 @@
+import secrets
+import time
+from functools import partial
+from typing import Callable
+
+import click
+from eth_typing import BLSPubkey, BLSSignature
+from sw_utils.typings import Bytes32
+from web3.types import Gwei
+
+from src.validators.encoding import (
+    encode_consolidations,
+    encode_validators,
+    encode_withdrawals,
+)
+from src.validators.typings import Validator, ValidatorType
+
+
+@click.command(help='Compares validators manager payload encoders with the previous ones.')
+@click.option('--counts', default='1000,10000', show_default=True)
+def main(counts: str) -> None:
+    for count in [int(c) for c in counts.split(',')]:
+        validators = [_random_validator(ValidatorType.V2) for _ in range(count)]
+        public_keys = [v.public_key for v in validators]
+        amounts = [v.amount for v in validators]
+        target_public_keys = public_keys[::-1]
+
+        _compare(
+            f'validators {count}',
+            partial(_encode_validators_legacy, validators),
+            partial(encode_validators, validators),
+        )
+        _compare(
+            f'withdrawals {count}',
+            partial(_encode_withdrawals_legacy, public_keys, amounts),
+            partial(encode_withdrawals, public_keys, amounts),
+        )
+        _compare(
+            f'consolidations {count}',
+            partial(_encode_consolidations_legacy, public_keys, target_public_keys),
+            partial(encode_consolidations, public_keys, target_public_keys),
+        )
+
+    # V1 records don't include the amount
+    validators = [_random_validator(ValidatorType.V1) for _ in range(10)]
+    if encode_validators(validators) != _encode_validators_legacy(validators):
+        raise click.ClickException('V1 validators: encoders produced different results')
+
+
+def _compare(name: str, legacy: Callable[[], bytes], current: Callable[[], bytes]) -> None:
+    legacy_elapsed, legacy_result = _measure(legacy)
+    elapsed, result = _measure(current)
+    if result != legacy_result:
+        raise click.ClickException(f'{name}: encoders produced different results')
+    click.echo(
+        f'{name:>20}: legacy {legacy_elapsed * 1000:9.3f}ms, current {elapsed * 1000:9.3f}ms'
+    )
+
+
+def _measure(fn: Callable[[], bytes]) -> tuple[float, bytes]:
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def _random_validator(validator_type: ValidatorType) -> Validator:
+    return Validator(
+        public_key=BLSPubkey(secrets.token_bytes(48)),
+        deposit_signature=BLSSignature(secrets.token_bytes(96)),
+        deposit_data_root=Bytes32(secrets.token_bytes(32)),
+        amount=Gwei(secrets.randbelow(2**64)),
+        validator_type=validator_type,
+    )
+
+
+# previous encoders, validators used to keep hex strings
+def _encode_validators_legacy(validators: list[Validator]) -> bytes:
+    encoded_validators = []
+    for v in validators:
+        encoded_validator = [v.public_key, v.deposit_signature, v.deposit_data_root]
+        if v.validator_type == ValidatorType.V2:
+            encoded_validator.append(v.amount.to_bytes(8, byteorder='big'))
+        encoded_validators.append(b''.join(encoded_validator))
+    return b''.join(encoded_validators)
+
+
+def _encode_withdrawals_legacy(public_keys: list[BLSPubkey], amounts: list[Gwei]) -> bytes:
+    data = b''
+    for public_key, amount in zip(public_keys, amounts):
+        data += public_key
+        data += amount.to_bytes(8, byteorder='big')
+    return data
+
+
+def _encode_consolidations_legacy(
+    source_public_keys: list[BLSPubkey], target_public_keys: list[BLSPubkey]
+) -> bytes:
+    validators_data = b''
+    for source_key, target_key in zip(source_public_keys, target_public_keys):
+        validators_data += source_key
+        validators_data += target_key
+    return validators_data
+
+
+if __name__ == '__main__':
+    main()  # pylint: disable=no-value-for-parameter
@@ -0,0 +1,89 @@
+import asyncio
+import statistics
+import time
+
+import click
+from web3 import AsyncWeb3, Web3
+
+from benchmarks.rpc_stub import RpcStub, RpcStubConfig
+from src.common.clients import ExecutionClients
+from src.common.contracts import VaultContract, get_contract
+
+VAULT = Web3.to_checksum_address('0x' + '22' * 20)
+BLOCK_NUMBER = 1000
+
+
+@click.command(help='Compares reads from one execution endpoint with hedged reads.')
+@click.option('--reads', type=int, default=1000, show_default=True)
+@click.option('--concurrency', type=int, default=10, show_default=True)
+@click.option('--latency', type=float, default=0.005, show_default=True, help='Seconds.')
+@click.option('--slow-ratio', type=float, default=0.02, show_default=True)
+@click.option('--slow-latency', type=float, default=1, show_default=True, help='Seconds.')
+def main(
+    reads: int, concurrency: int, latency: float, slow_ratio: float, slow_latency: float
+) -> None:
+    asyncio.run(_run(reads, concurrency, latency, slow_ratio, slow_latency))
+
+
+async def _run(
+    reads: int, concurrency: int, latency: float, slow_ratio: float, slow_latency: float
+) -> None:
+    stall_config = RpcStubConfig(
+        latency=latency,
+        slow_ratio=slow_ratio,
+        slow_latency=slow_latency,
+        block_number=BLOCK_NUMBER,
+    )
+    stubs = [RpcStub(stall_config), RpcStub(stall_config)]
+    # the fastest endpoint is behind and must not be used
+    lagging_stub = RpcStub(RpcStubConfig(block_number=BLOCK_NUMBER - 10))
+    for stub in [*stubs, lagging_stub]:
+        await stub.start()
+    try:
+        single = ExecutionClients([stubs[0].url])
+        _echo('single endpoint', await _measure(single, reads, concurrency))
+
+        hedged = ExecutionClients([lagging_stub.url, *(stub.url for stub in stubs)])
+        await hedged.check_health()
+        if hedged.endpoints[0].healthy:
+            raise click.ClickException('Lagging endpoint is not detected')
+        calls = sum(stub.calls_by_method.get('eth_call', 0) for stub in stubs)
+        latencies = await _measure(hedged, reads, concurrency)
+        _echo('hedged endpoints', latencies)
+
+        hedged_calls = sum(stub.calls_by_method.get('eth_call', 0) for stub in stubs) - calls
+        click.echo(f'hedged reads: {hedged_calls - len(latencies)} of {len(latencies)}')
+        if lagging_stub.calls_by_method.get('eth_call'):
+            raise click.ClickException('Lagging endpoint was used for reads')
+    finally:
+        for stub in [*stubs, lagging_stub]:
+            await stub.stop()
+
+
+async def _measure(clients: ExecutionClients, reads: int, concurrency: int) -> list[float]:
+    latencies: list[float] = []
+
+    async def read(client: AsyncWeb3) -> int:
+        contract = get_contract(VaultContract.abi_path, VAULT, client)
+        return await contract.functions.validatorsManagerNonce().call()
+
+    async def worker(count: int) -> None:
+        for _ in range(count):
+            start = time.perf_counter()
+            await clients.read(read)
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(worker(reads // concurrency) for _ in range(concurrency)))
+    return latencies
+
+
+def _echo(name: str, latencies: list[float]) -> None:
+    quantiles = statistics.quantiles(latencies, n=100)
+    click.echo(
+        f'{name:>16}: p50 {quantiles[49] * 1000:8.1f}ms, p95 {quantiles[94] * 1000:8.1f}ms, '
+        f'p99 {quantiles[98] * 1000:8.1f}ms, max {max(latencies) * 1000:8.1f}ms'
+    )
+
+
+if __name__ == '__main__':
+    main()  # pylint: disable=no-value-for-parameter
@@ -0,0 +1,45 @@
+import os
+import subprocess  # nosec
+import sys
+from collections import defaultdict
+
+import click
+
+
+@click.command(help='Reports import time of the app per module, based on `python -X importtime`.')
+@click.option('--module', default='src.app', show_default=True, help='Module to import.')
+@click.option('--top', type=int, default=20, show_default=True)
+def main(module: str, top: int) -> None:
+    result = subprocess.run(  # nosec
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        env={**os.environ, 'PYTHONPATH': '.'},
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if result.returncode != 0:
+        raise click.ClickException(result.stderr.strip().splitlines()[-1])
+
+    # self time per imported module, in microseconds
+    self_times: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_time, _, name = line.removeprefix('import time:').split('|')
+        self_times[name.strip()] = int(self_time)
+
+    packages: dict[str, int] = defaultdict(int)
+    for name, self_us in self_times.items():
+        packages[name.split('.')[0]] += self_us
+
+    click.echo(f'Total import time of {module}: {sum(self_times.values()) / 1000:.1f}ms')
+    click.echo('\nPackages:')
+    for name, self_us in sorted(packages.items(), key=lambda i: -i[1])[:top]:
+        click.echo(f'{self_us / 1000:10.1f}ms  {name}')
+    click.echo('\nModules:')
+    for name, self_us in sorted(self_times.items(), key=lambda i: -i[1])[:top]:
+        click.echo(f'{self_us / 1000:10.1f}ms  {name}')
+
+
+if __name__ == '__main__':
+    main()  # pylint: disable=no-value-for-parameter
@@ -0,0 +1,36 @@
+import secrets
+import time
+
+import click
+from eth_typing import BLSPrivateKey
+from py_ecc.optimized_bls12_381.optimized_curve import curve_order
+
+from src.validators.credentials import COIN_TYPE, PURPOSE, DerivationTree
+
+
+@click.command(help='Measures per-validator cost of EIP-2333 key derivation.')
+@click.option(
+    '--counts',
+    default='1,100,1000',
+    show_default=True,
+    help='Comma separated numbers of validators.',
+)
+def main(counts: str) -> None:
+    for count in [int(c) for c in counts.split(',')]:
+        for cache_size in (0, 1024):
+            root_key = BLSPrivateKey(secrets.randbelow(curve_order))
+            tree = DerivationTree(root_key, cache_size=cache_size)
+
+            start = time.perf_counter()
+            for index in range(count):
+                tree.derive(f'm/{PURPOSE}/{COIN_TYPE}/{index}/0/0')
+            elapsed = time.perf_counter() - start
+
+            click.echo(
+                f'validators: {count:>5}, cache size: {cache_size:>4}, '
+                f'{elapsed / count * 1000:8.3f}ms per validator'
+            )
+
+
+if __name__ == '__main__':
+    main()  # pylint: disable=no-value-for-parameter
@@ -0,0 +1,96 @@
+import secrets
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+
+import click
+from eth_typing import BLSPrivateKey
+from py_ecc.optimized_bls12_381.optimized_curve import curve_order
+from web3 import Web3
+
+from src.config.settings import KEYSTORE_KDF_PBKDF2, KEYSTORE_KDF_SCRYPT
+from src.validators.credentials import Credential
+from src.validators.keystore_store import KeystoreRow, KeystoreStore, encrypt_keystores
+
+VAULT = Web3.to_checksum_address('0x' + '22' * 20)
+INSERT_BATCH_SIZE = 1000
+LOOKUPS = 10000
+PASSWORD = 'benchmark'
+
+
+@click.command(help='Measures bulk import of keystores and public key lookups.')
+@click.option('--counts', default='10000,100000', show_default=True)
+@click.option(
+    '--kdf', type=click.Choice([KEYSTORE_KDF_SCRYPT, KEYSTORE_KDF_PBKDF2]), default='scrypt'
+)
+@click.option('--workers', type=int, default=4, show_default=True)
+@click.option(
+    '--encrypt-sample',
+    type=int,
+    default=32,
+    show_default=True,
+    help='Keys encrypted to measure KDF throughput, full counts would take hours with scrypt.',
+)
+def main(counts: str, kdf: str, workers: int, encrypt_sample: int) -> None:
+    keys_per_second, keystore = _measure_encryption(kdf, workers, encrypt_sample)
+    click.echo(f'encryption ({kdf}, {workers} workers): {keys_per_second:.1f} keys/s')
+
+    for count in [int(c) for c in counts.split(',')]:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            store = KeystoreStore(path=str(Path(tmp_dir) / 'keystores.db'))
+            public_keys = [secrets.token_bytes(48) for _ in range(count)]
+
+            start = time.perf_counter()
+            for offset in range(0, count, INSERT_BATCH_SIZE):
+                rows: list[KeystoreRow] = [
+                    (public_key, VAULT, 'hoodi', '', keystore, time.time())
+                    for public_key in public_keys[offset : offset + INSERT_BATCH_SIZE]
+                ]
+                store.insert(rows)
+            insert_elapsed = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for _ in range(LOOKUPS):
+                if store.get_keystore(secrets.choice(public_keys)) is None:
+                    raise click.ClickException('Keystore not found')
+            lookup_elapsed = time.perf_counter() - start
+            store.close()
+
+        click.echo(
+            f'{count:>8} keys: insert {insert_elapsed:7.2f}s, '
+            f'lookup {lookup_elapsed / LOOKUPS * 10**6:6.1f}us, '
+            f'encryption {count / keys_per_second:9.1f}s (projected)'
+        )
+
+
+def _measure_encryption(kdf: str, workers: int, count: int) -> tuple[float, str]:
+    credentials = [
+        Credential(
+            private_key=BLSPrivateKey(secrets.randbelow(curve_order)),
+            network='hoodi',
+            vault=VAULT,
+            path=f'm/12381/3600/{i}/0/0',
+        )
+        for i in range(count)
+    ]
+    batch_size = max(count // workers, 1)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # start workers before measuring
+        list(executor.map(partial(encrypt_keystores, password=PASSWORD, kdf=kdf), [[]] * workers))
+
+        start = time.perf_counter()
+        futures = [
+            executor.submit(
+                encrypt_keystores, credentials[offset : offset + batch_size], PASSWORD, kdf
+            )
+            for offset in range(0, count, batch_size)
+        ]
+        keystores = [keystore for future in futures for keystore in future.result()]
+        elapsed = time.perf_counter() - start
+    return count / elapsed, keystores[0]
+
+
+if __name__ == '__main__':
+    main()  # pylint: disable=no-value-for-parameter
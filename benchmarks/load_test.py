@@ -0,0 +1,241 @@
+import asyncio
+import json
+import os
+import secrets
+import signal
+import statistics
+import subprocess  # nosec
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+
+import click
+import httpx
+from eth_account import Account
+from web3 import Web3
+
+from benchmarks.rpc_stub import RpcStub, RpcStubConfig, get_free_port
+
+ENDPOINTS = ('register', 'fund', 'withdraw', 'consolidate')
+VAULT = Web3.to_checksum_address('0x' + '22' * 20)
+AMOUNT = 32 * 10**9
+
+
+@dataclass
+class Scenario:
+    endpoint: str
+    batch_size: int
+    concurrency: int
+    requests: int
+
+
+@dataclass
+class Latency:
+    p50: float
+    p95: float
+    p99: float
+
+
+@dataclass
+class Throughput:
+    requests_per_second: float
+    validators_per_second: float
+    cpu_seconds_per_validator: float | None
+
+
+@dataclass
+class ScenarioResult:
+    scenario: Scenario
+    errors: int
+    latency: Latency
+    throughput: Throughput
+
+
+@click.command(help='Runs the relayer against a local JSON-RPC stub and measures latency.')
+@click.option('--endpoints', default=','.join(ENDPOINTS), show_default=True)
+@click.option('--batch-sizes', default='1,10,100', show_default=True)
+@click.option('--concurrency', type=int, default=10, show_default=True)
+@click.option('--requests', type=int, default=100, show_default=True, help='Per scenario.')
+@click.option('--rpc-latency', type=float, default=0.05, show_default=True, help='Seconds.')
+@click.option('--output', type=click.Path(path_type=Path), default=Path('bench_results.json'))
+def main(  # pylint: disable=too-many-arguments
+    endpoints: str,
+    batch_sizes: str,
+    concurrency: int,
+    requests: int,
+    rpc_latency: float,
+    output: Path,
+) -> None:
+    scenarios = [
+        Scenario(
+            endpoint=endpoint,
+            batch_size=int(batch_size),
+            concurrency=concurrency,
+            requests=requests,
+        )
+        for endpoint in endpoints.split(',')
+        for batch_size in batch_sizes.split(',')
+    ]
+    results = asyncio.run(_run(scenarios, rpc_latency))
+    for result in results:
+        scenario, latency = result.scenario, result.latency
+        click.echo(
+            f'{scenario.endpoint:>12} batch {scenario.batch_size:>5}: '
+            f'p50 {latency.p50 * 1000:8.1f}ms, p95 {latency.p95 * 1000:8.1f}ms, '
+            f'p99 {latency.p99 * 1000:8.1f}ms, '
+            f'{result.throughput.requests_per_second:8.1f} rps, errors {result.errors}'
+        )
+
+    report = {
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'rpc_latency': rpc_latency,
+        'crypto_workers': os.environ.get('CRYPTO_WORKERS'),
+        'results': [asdict(r) for r in results],
+    }
+    output.write_text(json.dumps(report, indent=2), encoding='utf-8')
+    click.echo(f'Results saved to {output}')
+
+
+async def _run(scenarios: list[Scenario], rpc_latency: float) -> list[ScenarioResult]:
+    rpc_stub = RpcStub(RpcStubConfig(latency=rpc_latency))
+    await rpc_stub.start()
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            port = get_free_port()
+            process = _start_relayer(Path(tmp_dir), port, rpc_stub.url)
+            try:
+                base_url = f'http://127.0.0.1:{port}'
+                async with httpx.AsyncClient(base_url=base_url, timeout=600) as client:
+                    await _wait_ready(client, process)
+                    return [
+                        await _run_scenario(client, process.pid, scenario) for scenario in scenarios
+                    ]
+            finally:
+                process.send_signal(signal.SIGINT)
+                process.wait()
+    finally:
+        await rpc_stub.stop()
+
+
+def _start_relayer(tmp_dir: Path, port: int, execution_endpoint: str) -> subprocess.Popen:
+    password = secrets.token_hex(16)
+    # cheap KDF, the benchmark doesn't measure keystore decryption
+    keystore = Account.encrypt(Account().create().key, password, kdf='pbkdf2', iterations=1024)
+    key_file, password_file = tmp_dir / 'key.json', tmp_dir / 'password.txt'
+    key_file.write_text(json.dumps(keystore), encoding='utf-8')
+    password_file.write_text(password, encoding='utf-8')
+
+    env = {
+        **os.environ,
+        'EXECUTION_ENDPOINTS': execution_endpoint,
+        'VALIDATORS_MANAGER_KEY_FILE': str(key_file),
+        'VALIDATORS_MANAGER_PASSWORD_FILE': str(password_file),
+        'LOG_LEVEL': os.environ.get('LOG_LEVEL', 'WARNING'),
+    }
+    return subprocess.Popen(  # nosec
+        [sys.executable, '-m', 'uvicorn', 'src.app:app', '--port', str(port)],
+        env=env,
+    )
+
+
+async def _wait_ready(client: httpx.AsyncClient, process: subprocess.Popen) -> None:
+    while process.poll() is None:
+        try:
+            # `/ready` responds with 503 until crypto workers of all server workers are warm
+            if (await client.get('/ready')).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.1)
+    raise click.ClickException('Relayer exited before it was ready')
+
+
+async def _run_scenario(client: httpx.AsyncClient, pid: int, scenario: Scenario) -> ScenarioResult:
+    queue: asyncio.Queue[int] = asyncio.Queue()
+    for i in range(scenario.requests):
+        queue.put_nowait(i)
+    latencies: list[float] = []
+    errors = 0
+
+    async def worker() -> None:
+        nonlocal errors
+        while not queue.empty():
+            i = queue.get_nowait()
+            payload = _get_payload(
+                scenario.endpoint, scenario.batch_size, start_index=i * scenario.batch_size
+            )
+            start = time.perf_counter()
+            response = await client.post(f'/{scenario.endpoint}', json=payload)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                errors += 1
+
+    cpu_before = _get_cpu_time(pid)
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(scenario.concurrency)))
+    elapsed = time.perf_counter() - start
+    cpu_after = _get_cpu_time(pid)
+
+    validators = scenario.requests * scenario.batch_size
+    cpu_per_validator = None
+    if cpu_before is not None and cpu_after is not None:
+        cpu_per_validator = (cpu_after - cpu_before) / validators
+
+    return ScenarioResult(
+        scenario=scenario,
+        errors=errors,
+        latency=_get_latency(latencies),
+        throughput=Throughput(
+            requests_per_second=scenario.requests / elapsed,
+            validators_per_second=validators / elapsed,
+            cpu_seconds_per_validator=cpu_per_validator,
+        ),
+    )
+
+
+def _get_latency(latencies: list[float]) -> Latency:
+    quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    return Latency(p50=quantiles[49], p95=quantiles[94], p99=quantiles[98])
+
+
+def _get_payload(endpoint: str, batch_size: int, start_index: int) -> dict:
+    public_keys = [Web3.to_hex(secrets.token_bytes(48)) for _ in range(batch_size)]
+    amounts = [AMOUNT] * batch_size
+    if endpoint == 'register':
+        return {
+            'vault': VAULT,
+            'validators_start_index': start_index,
+            'amounts': amounts,
+            'validator_type': '0x02',
+        }
+    if endpoint == 'consolidate':
+        return {
+            'vault': VAULT,
+            'source_public_keys': public_keys,
+            'target_public_keys': public_keys[::-1],
+        }
+    return {'vault': VAULT, 'public_keys': public_keys, 'amounts': amounts}
+
+
+def _get_cpu_time(pid: int) -> float | None:
+    """CPU seconds used by the process and its children (crypto workers), Linux only."""
+    try:
+        with open(f'/proc/{pid}/stat', encoding='utf-8') as f:
+            fields = f.read().rsplit(')', 1)[1].split()
+        with open(f'/proc/{pid}/task/{pid}/children', encoding='utf-8') as f:
+            children = [int(child) for child in f.read().split()]
+    except OSError:
+        return None
+
+    # utime and stime, in clock ticks
+    cpu_time = (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+    for child in children:
+        cpu_time += _get_cpu_time(child) or 0
+    return cpu_time
+
+
+if __name__ == '__main__':
+    main()  # pylint: disable=no-value-for-parameter
@@ -0,0 +1,107 @@
+import asyncio
+import random
+import socket
+from dataclasses import dataclass
+
+import uvicorn
+from eth_utils import function_signature_to_4byte_selector
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+GET_DEPOSIT_ROOT_SELECTOR = '0x' + function_signature_to_4byte_selector('get_deposit_root()').hex()
+VALIDATORS_MANAGER_NONCE_SELECTOR = (
+    '0x' + function_signature_to_4byte_selector('validatorsManagerNonce()').hex()
+)
+
+
+@dataclass
+class RpcStubConfig:
+    latency: float = 0
+    # share of calls answered after `slow_latency` instead, e.g. a node stalled by GC or I/O
+    slow_ratio: float = 0
+    slow_latency: float = 0
+    chain_id: int = 560048
+    block_number: int = 1
+    deposit_root: bytes = b'\x01' * 32
+    validators_manager_nonce: int = 0
+
+
+class RpcStub:
+    """
+    Local JSON-RPC server answering the execution client calls made by the relayer:
+    `get_deposit_root` and `validatorsManagerNonce` with the configured latency.
+    Calls are counted per method.
+    """
+
+    def __init__(self, config: RpcStubConfig) -> None:
+        self.config = config
+        self.calls = 0
+        self.calls_by_method: dict[str, int] = {}
+        self.port = get_free_port()
+        self._server: uvicorn.Server | None = None
+        self._task: asyncio.Task | None = None
+
+    @property
+    def url(self) -> str:
+        return f'http://127.0.0.1:{self.port}'
+
+    async def start(self) -> None:
+        app = Starlette(routes=[Route('/', self._handle, methods=['POST'])])
+        self._server = uvicorn.Server(
+            uvicorn.Config(app, host='127.0.0.1', port=self.port, log_level='warning')
+        )
+        self._task = asyncio.create_task(self._server.serve())
+        while not self._server.started:
+            await asyncio.sleep(0.01)
+
+    async def stop(self) -> None:
+        if self._server is None or self._task is None:
+            return
+        self._server.should_exit = True
+        await self._task
+
+    async def _handle(self, request: Request) -> JSONResponse:
+        payload = await request.json()
+        if isinstance(payload, list):
+            return JSONResponse([await self._call(item) for item in payload])
+        return JSONResponse(await self._call(payload))
+
+    async def _call(self, payload: dict) -> dict:
+        self.calls += 1
+        method: str = payload.get('method', '')
+        params = payload.get('params') or []
+        self.calls_by_method[method] = self.calls_by_method.get(method, 0) + 1
+
+        latency = self.config.latency
+        if self.config.slow_ratio and random.random() < self.config.slow_ratio:  # nosec
+            latency = self.config.slow_latency
+        if latency:
+            await asyncio.sleep(latency)
+
+        result: str | None = None
+        if method == 'eth_chainId':
+            result = hex(self.config.chain_id)
+        elif method == 'eth_blockNumber':
+            result = hex(self.config.block_number)
+        elif method == 'eth_call':
+            data = params[0].get('data') or params[0].get('input') or ''
+            if data.startswith(GET_DEPOSIT_ROOT_SELECTOR):
+                result = '0x' + self.config.deposit_root.hex()
+            elif data.startswith(VALIDATORS_MANAGER_NONCE_SELECTOR):
+                result = '0x' + self.config.validators_manager_nonce.to_bytes(32, 'big').hex()
+
+        if result is None:
+            return {
+                'jsonrpc': '2.0',
+                'id': payload.get('id'),
+                'error': {'code': -32601, 'message': f'Unsupported call: {method}'},
+            }
+        return {'jsonrpc': '2.0', 'id': payload.get('id'), 'result': result}
+
+
+def get_free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
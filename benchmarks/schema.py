@@ -0,0 +1,142 @@
+import json
+import secrets
+import time
+from functools import partial
+from typing import Callable
+
+import click
+from eth_typing import ChecksumAddress, HexStr
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from web3 import Web3
+from web3.types import Gwei
+
+from src.common.responses import PydanticJSONResponse
+from src.validators import schema
+
+VAULT = Web3.to_checksum_address('0x' + '22' * 20)
+
+
+@click.command(help='Compares request parsing and response rendering with the previous models.')
+@click.option('--counts', default='1000,10000', show_default=True)
+@click.option('--repeat', type=int, default=10, show_default=True)
+def main(counts: str, repeat: int) -> None:
+    for count in [int(c) for c in counts.split(',')]:
+        public_keys = [secrets.token_bytes(48) for _ in range(count)]
+        amounts = [secrets.randbelow(2**64) for _ in range(count)]
+        body = json.dumps(
+            {
+                'vault': VAULT,
+                'public_keys': [Web3.to_hex(public_key) for public_key in public_keys],
+                'amounts': amounts,
+            }
+        )
+
+        if _parse(body) != _parse_legacy(body):
+            raise click.ClickException('Parsers produced different results')
+        _echo(
+            f'parse withdraw {count}',
+            count,
+            _measure(partial(_parse_legacy, body), repeat),
+            _measure(partial(_parse, body), repeat),
+        )
+
+        signatures = [(secrets.token_bytes(96), secrets.token_bytes(96)) for _ in range(count)]
+        items = [
+            (public_key, deposit_signature, amount, exit_signature)
+            for public_key, amount, (deposit_signature, exit_signature) in zip(
+                public_keys, amounts, signatures
+            )
+        ]
+        if json.loads(_render(items)) != json.loads(_render_legacy(items)):
+            raise click.ClickException('Renderers produced different results')
+        _echo(
+            f'render register {count}',
+            count,
+            _measure(partial(_render_legacy, items), repeat),
+            _measure(partial(_render, items), repeat),
+        )
+
+
+def _parse(body: str) -> tuple[list[bytes], list[int]]:
+    request = schema.ValidatorsWithdrawalRequest.model_validate_json(body)
+    return request.public_keys, request.amounts
+
+
+def _render(items: list[tuple[bytes, bytes, int, bytes]]) -> bytes:
+    validators = [
+        schema.ValidatorsRegisterResponseItem.model_construct(
+            public_key=public_key,
+            deposit_signature=deposit_signature,
+            amount=amount,
+            exit_signature=exit_signature,
+        )
+        for public_key, deposit_signature, amount, exit_signature in items
+    ]
+    response = schema.ValidatorsRegisterResponse.model_construct(
+        validators=validators, validators_manager_signature=HexStr('0x' + '33' * 65)
+    )
+    return PydanticJSONResponse(response).body
+
+
+# previous models, public keys were kept as hex strings and decoded by the endpoints
+class LegacyWithdrawalRequest(BaseModel):
+    vault: ChecksumAddress
+    public_keys: list[HexStr]
+    amounts: list[Gwei]
+
+
+class LegacyRegisterResponseItem(BaseModel):
+    public_key: HexStr
+    deposit_signature: HexStr
+    amount: Gwei
+    exit_signature: HexStr
+
+
+class LegacyRegisterResponse(BaseModel):
+    validators: list[LegacyRegisterResponseItem]
+    validators_manager_signature: HexStr
+
+
+def _parse_legacy(body: str) -> tuple[list[bytes], list[int]]:
+    # FastAPI decodes the body before validation
+    request = LegacyWithdrawalRequest.model_validate(json.loads(body))
+    public_keys = [Web3.to_bytes(hexstr=public_key) for public_key in request.public_keys]
+    return public_keys, request.amounts
+
+
+def _render_legacy(items: list[tuple[bytes, bytes, int, bytes]]) -> bytes:
+    validators = [
+        LegacyRegisterResponseItem(
+            public_key=Web3.to_hex(public_key),
+            deposit_signature=Web3.to_hex(deposit_signature),
+            amount=Gwei(amount),
+            exit_signature=Web3.to_hex(exit_signature),
+        )
+        for public_key, deposit_signature, amount, exit_signature in items
+    ]
+    response = LegacyRegisterResponse(
+        validators=validators, validators_manager_signature=HexStr('0x' + '33' * 65)
+    )
+    # FastAPI default rendering of returned models
+    return JSONResponse(jsonable_encoder(response)).body
+
+
+def _measure(fn: Callable, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def _echo(name: str, count: int, legacy_elapsed: float, elapsed: float) -> None:
+    click.echo(
+        f'{name:>22}: legacy {legacy_elapsed * 1000:9.3f}ms '
+        f'({count / legacy_elapsed:9.0f} items/s), '
+        f'current {elapsed * 1000:9.3f}ms ({count / elapsed:9.0f} items/s)'
+    )
+
+
+if __name__ == '__main__':
+    main()  # pylint: disable=no-value-for-parameter
@@ -0,0 +1,103 @@
+import secrets
+import time
+
+import click
+from eth_typing import BLSPrivateKey
+from py_ecc.optimized_bls12_381.optimized_curve import curve_order
+from sw_utils import get_exit_message_signing_root
+from sw_utils.signing import (
+    DepositData,
+    DepositMessage,
+    compute_deposit_domain,
+    compute_signing_root,
+)
+from web3 import Web3
+
+from src.config import settings
+from src.config.networks import NETWORKS
+from src.validators.bls_backends import get_bls_backend
+from src.validators.credentials import Credential
+from src.validators.signing import (
+    build_deposit_datum,
+    get_exit_signing_root,
+    get_signing_context,
+)
+
+VAULT = Web3.to_checksum_address('0x' + '22' * 20)
+AMOUNT = 32 * 10**9
+
+
+@click.command(help='Compares per-validator deposit and exit signing with the previous builder.')
+@click.option('--validators', type=int, default=200, show_default=True)
+def main(validators: int) -> None:
+    credentials = [
+        Credential(
+            private_key=BLSPrivateKey(secrets.randbelow(curve_order)),
+            network=settings.network,
+            vault=VAULT,
+        )
+        for _ in range(validators)
+    ]
+    # public keys and withdrawal credentials are shared by both builders
+    for credential in credentials:
+        _ = credential.public_key, credential.withdrawal_credentials
+
+    start = time.perf_counter()
+    legacy_results = [_sign_legacy(c, index) for index, c in enumerate(credentials)]
+    legacy_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    results = [_sign(c, index) for index, c in enumerate(credentials)]
+    elapsed = time.perf_counter() - start
+
+    if results != legacy_results:
+        raise click.ClickException('Builders produced different results')
+    click.echo(
+        f'per validator: legacy {legacy_elapsed / validators * 1000:8.3f}ms, '
+        f'current {elapsed / validators * 1000:8.3f}ms'
+    )
+
+
+def _sign(credential: Credential, validator_index: int) -> tuple[bytes, ...]:
+    context = get_signing_context(credential.network)
+    deposit_datum = build_deposit_datum(
+        context=context,
+        private_key=credential.private_key,
+        public_key=credential.public_key,
+        withdrawal_credentials=credential.withdrawal_credentials,
+        amount=AMOUNT,
+    )
+    return (
+        deposit_datum.deposit_message_root,
+        deposit_datum.signature,
+        deposit_datum.deposit_data_root,
+        get_exit_signing_root(context, validator_index),
+    )
+
+
+# previous implementation, domains and deposit message are computed for every validator
+def _sign_legacy(credential: Credential, validator_index: int) -> tuple[bytes, ...]:
+    domain = compute_deposit_domain(NETWORKS[credential.network].GENESIS_FORK_VERSION)
+    deposit_message = DepositMessage(
+        pubkey=credential.public_key,
+        withdrawal_credentials=credential.withdrawal_credentials,
+        amount=AMOUNT,
+    )
+    signing_root = compute_signing_root(deposit_message, domain)
+    signature = get_bls_backend().sign(credential.private_key, signing_root)
+    deposit_data = DepositData(**deposit_message.as_dict(), signature=signature)
+    exit_signing_root = get_exit_message_signing_root(
+        validator_index=validator_index,
+        genesis_validators_root=settings.network_config.GENESIS_VALIDATORS_ROOT,
+        fork=settings.network_config.SHAPELLA_FORK,
+    )
+    return (
+        bytes(deposit_message.hash_tree_root),
+        bytes(signature),
+        bytes(deposit_data.hash_tree_root),
+        bytes(exit_signing_root),
+    )
+
+
+if __name__ == '__main__':
+    main()  # pylint: disable=no-value-for-parameter
@@ -0,0 +1,87 @@
+import asyncio
+import json
+import os
+import secrets
+import signal
+import subprocess  # nosec
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import click
+import httpx
+from eth_account import Account
+
+from benchmarks.rpc_stub import RpcStub, RpcStubConfig, get_free_port
+
+
+@click.command(help='Measures time until all relayer workers report ready.')
+@click.option('--workers', default='1,2,4', show_default=True, help='Values of RELAYER_WORKERS.')
+@click.option('--runs', type=int, default=3, show_default=True)
+def main(workers: str, runs: int) -> None:
+    asyncio.run(_run([int(w) for w in workers.split(',')], runs))
+
+
+async def _run(workers_counts: list[int], runs: int) -> None:
+    rpc_stub = RpcStub(RpcStubConfig())
+    await rpc_stub.start()
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            # default scrypt KDF, keystore decryption is part of the startup
+            key_file, password_file = _create_keystore(Path(tmp_dir))
+            for workers in workers_counts:
+                timings = [
+                    await _measure_startup(workers, key_file, password_file, rpc_stub.url)
+                    for _ in range(runs)
+                ]
+                click.echo(
+                    f'{workers:>3} workers: '
+                    f'min {min(timings):6.2f}s, avg {sum(timings) / len(timings):6.2f}s'
+                )
+    finally:
+        await rpc_stub.stop()
+
+
+def _create_keystore(tmp_dir: Path) -> tuple[Path, Path]:
+    password = secrets.token_hex(16)
+    keystore = Account.encrypt(Account().create().key, password)
+    key_file, password_file = tmp_dir / 'key.json', tmp_dir / 'password.txt'
+    key_file.write_text(json.dumps(keystore), encoding='utf-8')
+    password_file.write_text(password, encoding='utf-8')
+    return key_file, password_file
+
+
+async def _measure_startup(
+    workers: int, key_file: Path, password_file: Path, execution_endpoint: str
+) -> float:
+    port = get_free_port()
+    env = {
+        **os.environ,
+        'PYTHONPATH': '.',
+        'RELAYER_PORT': str(port),
+        'RELAYER_WORKERS': str(workers),
+        'EXECUTION_ENDPOINTS': execution_endpoint,
+        'VALIDATORS_MANAGER_KEY_FILE': str(key_file),
+        'VALIDATORS_MANAGER_PASSWORD_FILE': str(password_file),
+        'LOG_LEVEL': os.environ.get('LOG_LEVEL', 'WARNING'),
+    }
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, 'src/app.py'], env=env)  # nosec
+    try:
+        async with httpx.AsyncClient(base_url=f'http://127.0.0.1:{port}') as client:
+            while process.poll() is None:
+                try:
+                    if (await client.get('/ready')).status_code == 200:
+                        return time.perf_counter() - start
+                except httpx.TransportError:
+                    pass
+                await asyncio.sleep(0.05)
+        raise click.ClickException('Relayer exited before it was ready')
+    finally:
+        process.send_signal(signal.SIGTERM)
+        process.wait()
+
+
+if __name__ == '__main__':
+    main()  # pylint: disable=no-value-for-parameter
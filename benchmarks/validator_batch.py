@@ -0,0 +1,140 @@
+import pickle
+import secrets
+import time
+import tracemalloc
+from functools import partial
+from typing import Callable, Sequence
+
+import click
+from eth_typing import BLSPubkey, BLSSignature
+from sw_utils.typings import Bytes32
+from web3.types import Gwei
+
+from src.validators.encoding import encode_validators
+from src.validators.typings import Validator, ValidatorBatch, ValidatorType
+
+Fields = tuple[bytes, bytes, bytes, int, bytes]
+
+
+@click.command(help='Compares validator lists with array-backed validator batches.')
+@click.option('--counts', default='1000,10000', show_default=True)
+def main(counts: str) -> None:
+    for count in [int(c) for c in counts.split(',')]:
+        fields = [_random_fields() for _ in range(count)]
+
+        validators = _build_list(fields)
+        batch = _build_batch(fields)
+        if list(batch) != validators:
+            raise click.ClickException('Batch items differ from validators')
+        _echo(
+            count,
+            'build',
+            _format_time(partial(_build_list, fields)),
+            _format_time(partial(_build_batch, fields)),
+        )
+
+        list_pickle = pickle.dumps(validators)
+        batch_pickle = pickle.dumps(batch)
+        # results of crypto workers are unpickled in the main process
+        _echo(
+            count,
+            'memory',
+            f'{_measure_memory(partial(pickle.loads, list_pickle)) / 1024:9.1f}KiB',
+            f'{_measure_memory(partial(pickle.loads, batch_pickle)) / 1024:9.1f}KiB',
+        )
+        _echo(
+            count,
+            'pickle size',
+            f'{len(list_pickle) / 1024:9.1f}KiB',
+            f'{len(batch_pickle) / 1024:9.1f}KiB',
+        )
+        _echo(
+            count,
+            'pickle round trip',
+            _format_time(partial(_pickle_round_trip, validators)),
+            _format_time(partial(_pickle_round_trip, batch)),
+        )
+        # chunks of crypto workers are merged into one batch
+        list_chunks, batch_chunks = _chunks(validators), _chunks(batch)
+        _echo(
+            count,
+            'concat chunks',
+            _format_time(partial(_concat_lists, list_chunks)),
+            _format_time(partial(ValidatorBatch.concat, batch_chunks)),
+        )
+
+        if encode_validators(batch) != encode_validators(validators):
+            raise click.ClickException('Encoders produced different results')
+        _echo(
+            count,
+            'encode',
+            _format_time(partial(encode_validators, validators)),
+            _format_time(partial(encode_validators, batch)),
+        )
+
+
+def _random_fields() -> Fields:
+    return (
+        secrets.token_bytes(48),
+        secrets.token_bytes(96),
+        secrets.token_bytes(32),
+        secrets.randbelow(2**64),
+        secrets.token_bytes(96),
+    )
+
+
+def _build_list(fields: list[Fields]) -> list[Validator]:
+    return [
+        Validator(
+            public_key=BLSPubkey(public_key),
+            deposit_signature=BLSSignature(deposit_signature),
+            deposit_data_root=Bytes32(deposit_data_root),
+            amount=Gwei(amount),
+            validator_type=ValidatorType.V2,
+            exit_signature=BLSSignature(exit_signature),
+        )
+        for public_key, deposit_signature, deposit_data_root, amount, exit_signature in fields
+    ]
+
+
+def _build_batch(fields: list[Fields]) -> ValidatorBatch:
+    batch = ValidatorBatch(ValidatorType.V2)
+    for public_key, deposit_signature, deposit_data_root, amount, exit_signature in fields:
+        batch.append(public_key, deposit_signature, deposit_data_root, amount, exit_signature)
+    return batch
+
+
+def _pickle_round_trip(value: object) -> object:
+    return pickle.loads(pickle.dumps(value))
+
+
+def _concat_lists(chunks: list[list[Validator]]) -> list[Validator]:
+    return [v for chunk in chunks for v in chunk]
+
+
+def _chunks(validators: Sequence[Validator]) -> list:
+    return [validators[offset : offset + 100] for offset in range(0, len(validators), 100)]
+
+
+def _measure_memory(fn: Callable) -> int:
+    tracemalloc.start()
+    fn()
+    # the result is freed on return, the peak includes it
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def _format_time(fn: Callable, repeat: int = 10) -> str:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return f'{(time.perf_counter() - start) / repeat * 1000:9.3f}ms'
+
+
+def _echo(count: int, name: str, legacy: str, current: str) -> None:
+    click.echo(f'{count:>6} {name:>18}: list {legacy}, batch {current}')
+
+
+if __name__ == '__main__':
+    main()  # pylint: disable=no-value-for-parameter
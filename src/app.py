@@ -1,17 +1,32 @@
+import asyncio
 import logging
+import time
 from contextlib import asynccontextmanager
-from typing import AsyncIterator
+from typing import AsyncIterator, Awaitable, Callable
 
 import uvicorn
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse
 from starlette.middleware.cors import CORSMiddleware
 
+from src.common.admission import AdmissionRejectedError
 from src.common.app_state import AppState
+from src.common.clients import get_execution_clients
+from src.common.contracts import load_abis
 from src.common.endpoints import router as info_router
+from src.common.executor import CryptoQueueFullError, crypto_executor
+from src.common.idempotency import idempotency_cache
+from src.common.metrics import monitor_event_loop_lag, request_duration
 from src.common.setup_logging import setup_logging
+from src.common.workers import run_workers
 from src.config import settings
 from src.validators.endpoints import router
+from src.validators.key_pool import key_pool
+from src.validators.key_seed import key_index_allocator
+from src.validators.keystore_store import keystore_store
 from src.validators.validators_manager import load_validators_manager_account
+from src.validators.verification import InvalidSignatureError
+from src.validators.warm_up import warm_up
 
 setup_logging()
 logger = logging.getLogger(__name__)
@@ -21,13 +36,54 @@ logger = logging.getLogger(__name__)
 async def lifespan(app_instance: FastAPI) -> AsyncIterator:  # pylint:disable=unused-argument
     app_state = AppState()
 
-    # load validators manager account
-    validators_manager = load_validators_manager_account()
-    app_state.validators_manager_account = validators_manager
-    logger.info('validators manager address: %s', validators_manager.address)
+    # in multi-worker mode the account is loaded before workers are started
+    if not hasattr(app_state, 'validators_manager_account'):
+        load_validators_manager()
+
+    load_abis()
+    key_index_allocator.start()
+    crypto_executor.start()
+    key_pool.start()
+    keystore_store.start()
+    loop_lag_task = asyncio.create_task(monitor_event_loop_lag())
+    execution_health_task = None
+    if len(settings.execution_endpoints) > 1:
+        execution_health_task = asyncio.create_task(get_execution_clients().monitor_health())
+    # the server starts listening while warming up, `/ready` reports 503 until it completes
+    warm_up_task = asyncio.create_task(warm_up_and_set_ready())
 
     yield
 
+    warm_up_task.cancel()
+    loop_lag_task.cancel()
+    if execution_health_task is not None:
+        execution_health_task.cancel()
+    await key_pool.stop()
+    await keystore_store.stop()
+    crypto_executor.shutdown()
+    idempotency_cache.close()
+    key_index_allocator.close()
+
+
+async def warm_up_and_set_ready() -> None:
+    if settings.warm_up_enabled:
+        try:
+            await warm_up()
+        except Exception as e:
+            # first requests pay the costs instead
+            logger.error('warm-up failed: %s', e)
+
+    app_state = AppState()
+    app_state.ready = True
+    if app_state.workers_ready is not None:
+        app_state.workers_ready[app_state.worker_index] = 1
+
+
+def load_validators_manager() -> None:
+    validators_manager = load_validators_manager_account()
+    AppState().validators_manager_account = validators_manager
+    logger.info('validators manager address: %s', validators_manager.address)
+
 
 app = FastAPI(lifespan=lifespan)
 
@@ -40,9 +96,58 @@ app.add_middleware(  # type: ignore
     allow_headers=['*'],
 )
 
+
+@app.middleware('http')
+async def measure_request_duration(
+    request: Request, call_next: Callable[[Request], Awaitable[Response]]
+) -> Response:
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # use route template to keep label values bounded
+        route = request.scope.get('route')
+        path = getattr(route, 'path', 'unknown')
+        request_duration.labels(request.method, path, status).observe(time.perf_counter() - start)
+
+
+@app.exception_handler(CryptoQueueFullError)
+async def crypto_queue_full_handler(
+    request: Request, exc: CryptoQueueFullError  # pylint:disable=unused-argument
+) -> JSONResponse:
+    return JSONResponse(status_code=503, content={'detail': str(exc)})
+
+
+@app.exception_handler(AdmissionRejectedError)
+async def admission_rejected_handler(
+    request: Request, exc: AdmissionRejectedError  # pylint:disable=unused-argument
+) -> JSONResponse:
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={'detail': str(exc)},
+        headers={'Retry-After': str(exc.retry_after)},
+    )
+
+
+@app.exception_handler(InvalidSignatureError)
+async def invalid_signature_handler(
+    request: Request, exc: InvalidSignatureError  # pylint:disable=unused-argument
+) -> JSONResponse:
+    logger.error('signatures self-check failed: %s', exc)
+    return JSONResponse(status_code=500, content={'detail': str(exc)})
+
+
 app.include_router(router)
 app.include_router(info_router)
 
 
 if __name__ == '__main__':
-    uvicorn.run(app, host=settings.relayer_host, port=settings.relayer_port)
+    if settings.relayer_workers > 1:
+        # decrypt the keystore once, workers inherit the account
+        load_validators_manager()
+        run_workers(app)
+    else:
+        uvicorn.run(app, host=settings.relayer_host, port=settings.relayer_port)
@@ -0,0 +1,169 @@
+import asyncio
+import math
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import NoReturn
+
+from src.common.metrics import (
+    admission_in_flight_validators,
+    admission_queued_validators,
+    admission_rejections,
+    observe_stage,
+)
+from src.config import settings
+
+# weight of the latest queue delay in the moving average
+DELAY_SMOOTHING = 0.2
+
+
+class AdmissionRejectedError(Exception):
+    def __init__(self, message: str, status_code: int, retry_after: int) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+@dataclass
+class _Waiter:
+    vault: str
+    size: int
+    future: asyncio.Future[None]
+    created_at: float = field(default_factory=time.monotonic)
+
+
+class Admission:
+    """Validators admitted for generation, released once when the request is done."""
+
+    def __init__(self, controller: 'AdmissionController', size: int) -> None:
+        self._controller = controller
+        self.size = size
+
+    def release(self) -> None:
+        if self.size:
+            self._controller.release(self.size)
+            self.size = 0
+
+
+class AdmissionController:
+    """
+    Limits the number of validators generated at the same time by all requests
+    to `settings.admission_max_validators`. Requests over the budget wait in per-vault queues,
+    which are served round robin, so a vault with large batches doesn't delay other vaults.
+
+    Requests are rejected before queueing:
+    with 429 when the vault already has `settings.admission_vault_queue_size` validators queued,
+    with 503 when queued requests wait longer than `settings.admission_queue_target`.
+    A queued request is rejected with 503 after `settings.admission_queue_timeout`.
+    """
+
+    def __init__(self) -> None:
+        self._in_flight = 0
+        # vaults with waiting requests in round robin order
+        self._queues: OrderedDict[str, deque[_Waiter]] = OrderedDict()
+        self._queued_by_vault: dict[str, int] = {}
+        self._queued = 0
+        # moving average of the queue delay of admitted requests
+        self._delay = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return settings.admission_max_validators > 0
+
+    async def admit(self, vault: str, size: int) -> Admission:
+        if not self.enabled:
+            return Admission(self, 0)
+
+        vault = vault.lower()
+        # a batch larger than the budget runs alone
+        size = min(size, settings.admission_max_validators)
+        if not self._queues and self._in_flight + size <= settings.admission_max_validators:
+            self._grant(size, 0)
+            return Admission(self, size)
+
+        if self._queued_by_vault.get(vault, 0) + size > settings.admission_vault_queue_size:
+            self._reject('vault_queue', 'Too many validators queued for the vault', 429)
+        # the average is not updated while nothing is queued, it only applies to a backlog
+        if self._queues and self.get_queue_delay() > settings.admission_queue_target:
+            self._reject('overload', 'Validators queue is over the latency target', 503)
+
+        waiter = _Waiter(vault=vault, size=size, future=asyncio.get_running_loop().create_future())
+        self._enqueue(waiter)
+        try:
+            done, _ = await asyncio.wait([waiter.future], timeout=settings.admission_queue_timeout)
+        except BaseException:
+            self._cancel(waiter)
+            raise
+        if not done:
+            self._cancel(waiter)
+            self._reject('timeout', 'Validators queue is full, try again later', 503)
+        return Admission(self, size)
+
+    def release(self, size: int) -> None:
+        self._in_flight -= size
+        admission_in_flight_validators.set(self._in_flight)
+        self._dispatch()
+
+    def get_queue_delay(self) -> float:
+        """Expected wait of a new request: the longest current wait or the recent average."""
+        now = time.monotonic()
+        oldest_wait = max((now - queue[0].created_at for queue in self._queues.values()), default=0)
+        return max(self._delay, oldest_wait)
+
+    def _enqueue(self, waiter: _Waiter) -> None:
+        self._queues.setdefault(waiter.vault, deque()).append(waiter)
+        vault_queued = self._queued_by_vault.get(waiter.vault, 0)
+        self._queued_by_vault[waiter.vault] = vault_queued + waiter.size
+        self._set_queued(self._queued + waiter.size)
+
+    def _dispatch(self) -> None:
+        while self._queues:
+            vault, queue = next(iter(self._queues.items()))
+            waiter = queue[0]
+            if self._in_flight + waiter.size > settings.admission_max_validators:
+                # the head waits for capacity, smaller requests don't overtake it
+                return
+
+            self._dequeue(waiter)
+            self._grant(waiter.size, time.monotonic() - waiter.created_at)
+            waiter.future.set_result(None)
+            if vault in self._queues:
+                self._queues.move_to_end(vault)
+
+    def _dequeue(self, waiter: _Waiter) -> None:
+        queue = self._queues[waiter.vault]
+        queue.remove(waiter)
+        if not queue:
+            del self._queues[waiter.vault]
+        self._queued_by_vault[waiter.vault] -= waiter.size
+        if not self._queued_by_vault[waiter.vault]:
+            del self._queued_by_vault[waiter.vault]
+        self._set_queued(self._queued - waiter.size)
+
+    def _cancel(self, waiter: _Waiter) -> None:
+        if waiter.future.done():
+            # admitted at the same time as cancelled
+            self.release(waiter.size)
+            return
+        waiter.future.cancel()
+        self._dequeue(waiter)
+        # the cancelled request may have been blocking the queue
+        self._dispatch()
+
+    def _grant(self, size: int, delay: float) -> None:
+        self._in_flight += size
+        admission_in_flight_validators.set(self._in_flight)
+        self._delay += DELAY_SMOOTHING * (delay - self._delay)
+        observe_stage('admission_wait', delay)
+
+    def _set_queued(self, queued: int) -> None:
+        self._queued = queued
+        admission_queued_validators.set(queued)
+
+    def _reject(self, reason: str, message: str, status_code: int) -> NoReturn:
+        admission_rejections.labels(reason).inc()
+        retry_after = max(math.ceil(self.get_queue_delay()), 1)
+        raise AdmissionRejectedError(message, status_code=status_code, retry_after=retry_after)
+
+
+admission_controller = AdmissionController()
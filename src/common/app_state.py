@@ -1,3 +1,5 @@
+from typing import Any
+
 from eth_account.signers.local import LocalAccount
 
 from src.common.typings import Singleton
@@ -5,3 +7,10 @@ from src.common.typings import Singleton
 
 class AppState(metaclass=Singleton):
     validators_manager_account: LocalAccount
+
+    # startup of this process is complete
+    ready: bool = False
+
+    # multi-worker mode, readiness flags of all workers shared between processes
+    worker_index: int = 0
+    workers_ready: Any = None
@@ -0,0 +1,71 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, TypeVar
+
+from web3.types import BlockIdentifier, ChecksumAddress
+
+from src.common.metrics import rpc_cache_hits, rpc_cache_misses
+from src.config import settings
+
+T = TypeVar('T')
+
+# (contract address, method name, block tag)
+CacheKey = tuple[ChecksumAddress, str, BlockIdentifier]
+
+
+class RpcCache:
+    """
+    Read-through cache for contract calls.
+    Values expire after `settings.rpc_cache_ttl` seconds.
+    Concurrent callers of the same key await a single in-flight call.
+    """
+
+    def __init__(self) -> None:
+        self._values: OrderedDict[CacheKey, tuple[float, Any]] = OrderedDict()
+        self._pending: dict[CacheKey, asyncio.Future] = {}
+
+    async def get(self, key: CacheKey, fetch: Callable[[], Awaitable[T]]) -> T:
+        if settings.rpc_cache_ttl <= 0:
+            return await fetch()
+
+        cached = self._values.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            rpc_cache_hits.inc()
+            return cached[1]
+
+        pending = self._pending.get(key)
+        if pending is not None:
+            rpc_cache_hits.inc()
+            return await asyncio.shield(pending)
+
+        rpc_cache_misses.inc()
+        task = asyncio.ensure_future(fetch())
+        self._pending[key] = task
+        try:
+            value = await asyncio.shield(task)
+        finally:
+            # the key is removed from pending calls on invalidation,
+            # the value fetched before invalidation must not be cached
+            is_valid = self._pending.get(key) is task
+            if is_valid:
+                del self._pending[key]
+
+        if is_valid:
+            self._set(key, value)
+        return value
+
+    def invalidate(self, address: ChecksumAddress, method: str) -> None:
+        for key in [k for k in self._values if k[:2] == (address, method)]:
+            del self._values[key]
+        for key in [k for k in self._pending if k[:2] == (address, method)]:
+            del self._pending[key]
+
+    def _set(self, key: CacheKey, value: Any) -> None:
+        self._values.pop(key, None)
+        self._values[key] = (time.monotonic() + settings.rpc_cache_ttl, value)
+        while len(self._values) > settings.rpc_cache_max_size:
+            self._values.popitem(last=False)
+
+
+rpc_cache = RpcCache()
@@ -1,14 +1,199 @@
-from sw_utils import get_execution_client
+import asyncio
+import logging
+import time
+from collections import deque
+from functools import cache
+from typing import Awaitable, Callable, TypeVar
+
+import aiohttp
+from sw_utils import get_execution_client as build_execution_client
+from web3 import AsyncWeb3
+from web3.exceptions import ProviderConnectionError
 
 import src
+from src.common.metrics import execution_endpoint_healthy, hedged_reads
 from src.config import settings
 
-OPERATOR_USER_AGENT = f'StakeWise Relayer {src.__version__}'
+logger = logging.getLogger(__name__)
 
+T = TypeVar('T')
+
+OPERATOR_USER_AGENT = f'StakeWise Relayer {src.__version__}'
 
-execution_client = get_execution_client(
-    [settings.execution_endpoint],
-    timeout=settings.execution_timeout,
-    retry_timeout=settings.execution_retry_timeout,
-    user_agent=OPERATOR_USER_AGENT,
+# latencies kept per endpoint for the hedge delay percentile
+LATENCY_SAMPLES = 100
+# the default hedge delay is used until the endpoint has enough samples
+MIN_LATENCY_SAMPLES = 10
+# weight of the latest latency in the moving average used to rank endpoints
+LATENCY_SMOOTHING = 0.2
+# failures of the endpoint, other errors (e.g. contract reverts) are raised to the caller at once
+TRANSPORT_ERRORS = (
+    aiohttp.ClientError,
+    asyncio.TimeoutError,
+    ConnectionError,
+    ProviderConnectionError,
 )
+
+
+class ExecutionEndpoint:
+    def __init__(self, index: int, url: str) -> None:
+        self.index = index
+        self.client = build_execution_client(
+            [url],
+            timeout=settings.execution_timeout,
+            retry_timeout=settings.execution_retry_timeout,
+            user_agent=OPERATOR_USER_AGENT,
+        )
+        self.healthy = True
+        # moving average, unmeasured endpoints are tried first
+        self.latency = 0.0
+        self.latencies: deque[float] = deque(maxlen=LATENCY_SAMPLES)
+
+    def observe_latency(self, seconds: float) -> None:
+        self.latency += LATENCY_SMOOTHING * (seconds - self.latency)
+        self.latencies.append(seconds)
+
+    def get_hedge_delay(self) -> float:
+        if len(self.latencies) < MIN_LATENCY_SAMPLES:
+            return settings.execution_hedge_delay
+        latencies = sorted(self.latencies)
+        index = int(len(latencies) * settings.execution_hedge_percentile / 100)
+        return latencies[min(index, len(latencies) - 1)]
+
+    def set_healthy(self, healthy: bool) -> None:
+        self.healthy = healthy
+        execution_endpoint_healthy.labels(self.index).set(int(healthy))
+
+
+class ExecutionClients:
+    """
+    Execution clients of `settings.execution_endpoints`.
+    Reads go to the healthy endpoint with the lowest latency. When it doesn't respond
+    within `settings.execution_hedge_percentile` of its latencies, the read is also sent
+    to the next endpoint and the first response is used. Reads failed with transport errors
+    are retried on the next endpoint.
+
+    Endpoints are marked unhealthy on transport errors and when their block number is behind
+    the highest one by more than `settings.execution_max_block_lag`.
+    Block numbers are checked every `settings.execution_health_check_interval` seconds.
+    """
+
+    def __init__(self, urls: list[str]) -> None:
+        self.endpoints = [ExecutionEndpoint(index, url) for index, url in enumerate(urls)]
+
+    @property
+    def client(self) -> AsyncWeb3:
+        """Client of the first endpoint, used for ABI encoding and contract objects."""
+        return self.endpoints[0].client
+
+    async def read(self, fn: Callable[[AsyncWeb3], Awaitable[T]]) -> T:
+        endpoints = self._get_read_endpoints()
+        if len(endpoints) == 1:
+            return await fn(endpoints[0].client)
+
+        tasks: dict[asyncio.Future[T], ExecutionEndpoint] = {}
+        next_endpoints = iter(endpoints)
+
+        def send() -> bool:
+            endpoint = next(next_endpoints, None)
+            if endpoint is None:
+                return False
+            tasks[asyncio.ensure_future(self._timed_read(endpoint, fn))] = endpoint
+            return True
+
+        send()
+        hedge_delay: float | None = None
+        if settings.execution_hedge_percentile > 0:
+            hedge_delay = endpoints[0].get_hedge_delay()
+        error: BaseException | None = None
+        try:
+            while tasks:
+                done, _ = await asyncio.wait(
+                    tasks, timeout=hedge_delay, return_when=asyncio.FIRST_COMPLETED
+                )
+                # a read is hedged once
+                hedge_delay = None
+                if not done:
+                    if send():
+                        hedged_reads.inc()
+                    continue
+
+                for task in done:
+                    endpoint = tasks.pop(task)
+                    if (error := task.exception()) is None:
+                        return task.result()
+                    if not isinstance(error, TRANSPORT_ERRORS):
+                        raise error
+                    logger.warning('execution endpoint %d read failed: %r', endpoint.index, error)
+                    send()
+        finally:
+            for task in tasks:
+                task.cancel()
+        if error is None:
+            raise RuntimeError('No execution endpoint responded')
+        raise error
+
+    async def check_health(self) -> None:
+        results = await asyncio.gather(
+            *(self._timed_read(e, _get_block_number) for e in self.endpoints),
+            return_exceptions=True,
+        )
+        block_numbers = [r for r in results if isinstance(r, int)]
+        highest_block_number = max(block_numbers, default=0)
+        for endpoint, result in zip(self.endpoints, results):
+            if isinstance(result, BaseException):
+                logger.warning('execution endpoint %d is unavailable: %r', endpoint.index, result)
+                endpoint.set_healthy(False)
+                continue
+            is_synced = highest_block_number - result <= settings.execution_max_block_lag
+            if not is_synced:
+                logger.warning(
+                    'execution endpoint %d is behind: block %d, highest %d',
+                    endpoint.index,
+                    result,
+                    highest_block_number,
+                )
+            endpoint.set_healthy(is_synced)
+
+    async def monitor_health(self) -> None:
+        while True:
+            try:
+                await self.check_health()
+            except Exception as e:  # pylint: disable=broad-except
+                logger.exception(e)
+            await asyncio.sleep(settings.execution_health_check_interval)
+
+    def _get_read_endpoints(self) -> list[ExecutionEndpoint]:
+        # unhealthy endpoints are the last resort when all others fail
+        return sorted(self.endpoints, key=lambda e: (not e.healthy, e.latency))
+
+    @staticmethod
+    async def _timed_read(
+        endpoint: ExecutionEndpoint, fn: Callable[[AsyncWeb3], Awaitable[T]]
+    ) -> T:
+        start = time.perf_counter()
+        try:
+            result = await fn(endpoint.client)
+        except asyncio.CancelledError:
+            # the read lost to a hedged one, the elapsed time is the lower bound of its latency
+            endpoint.observe_latency(time.perf_counter() - start)
+            raise
+        except TRANSPORT_ERRORS:
+            endpoint.set_healthy(False)
+            raise
+        endpoint.observe_latency(time.perf_counter() - start)
+        return result
+
+
+async def _get_block_number(client: AsyncWeb3) -> int:
+    return await client.eth.block_number
+
+
+@cache
+def get_execution_clients() -> ExecutionClients:
+    """The clients are created on first use instead of at import time."""
+    return ExecutionClients(settings.execution_endpoints)
+
+
+def get_execution_client() -> AsyncWeb3:
+    return get_execution_clients().client
@@ -1,14 +1,18 @@
 import json
 import os
-from functools import cached_property
+from functools import cache, cached_property, lru_cache
+from typing import Any
 
 from eth_typing import HexStr
 from sw_utils.typings import Bytes32
+from web3 import AsyncWeb3
 from web3.contract import AsyncContract
 from web3.contract.async_contract import AsyncContractEvents, AsyncContractFunctions
 from web3.types import ChecksumAddress
 
-from src.common.clients import execution_client
+from src.common.cache import rpc_cache
+from src.common.clients import get_execution_client, get_execution_clients
+from src.common.metrics import rpc_duration
 from src.config import settings
 
 
@@ -25,10 +29,7 @@ class ContractWrapper:
 
     @cached_property
     def contract(self) -> AsyncContract:
-        current_dir = os.path.dirname(__file__)
-        with open(os.path.join(current_dir, self.abi_path), encoding='utf-8') as f:
-            abi = json.load(f)
-        return execution_client.eth.contract(abi=abi, address=self.contract_address)
+        return get_contract(self.abi_path, self.contract_address)
 
     @property
     def functions(self) -> AsyncContractFunctions:
@@ -41,6 +42,17 @@ class ContractWrapper:
     def encode_abi(self, fn_name: str, args: list | None = None) -> HexStr:
         return self.contract.encode_abi(fn_name=fn_name, args=args)
 
+    async def _cached_call(self, fn_name: str) -> Any:
+        async def read(client: AsyncWeb3) -> Any:
+            contract = get_contract(self.abi_path, self.contract_address, client)
+            return await getattr(contract.functions, fn_name)().call()
+
+        async def fetch() -> Any:
+            with rpc_duration.labels(fn_name).time():
+                return await get_execution_clients().read(read)
+
+        return await rpc_cache.get((self.contract_address, fn_name, 'latest'), fetch)
+
 
 class ValidatorsRegistryContract(ContractWrapper):
     abi_path = 'abi/IValidatorsRegistry.json'
@@ -48,14 +60,44 @@ class ValidatorsRegistryContract(ContractWrapper):
 
     async def get_registry_root(self) -> Bytes32:
         """Fetches the latest validators registry root."""
-        return await self.contract.functions.get_deposit_root().call()
+        return await self._cached_call('get_deposit_root')
 
 
 class VaultContract(ContractWrapper):
     abi_path = 'abi/IEthVault.json'
 
     async def validators_manager_nonce(self) -> int:
-        return await self.contract.functions.validatorsManagerNonce().call()
+        return await self._cached_call('validatorsManagerNonce')
+
+    def invalidate_validators_manager_nonce(self) -> None:
+        """Must be called once the signature for the current nonce is issued."""
+        rpc_cache.invalidate(self.contract_address, 'validatorsManagerNonce')
 
 
 validators_registry_contract = ValidatorsRegistryContract()
+
+
+def load_abis() -> None:
+    """Parses contract ABIs once at startup."""
+    for contract_class in (ValidatorsRegistryContract, VaultContract):
+        get_contract_factory(contract_class.abi_path)
+
+
+@cache
+def get_abi(abi_path: str) -> list[dict]:
+    current_dir = os.path.dirname(__file__)
+    with open(os.path.join(current_dir, abi_path), encoding='utf-8') as f:
+        return json.load(f)
+
+
+@cache
+def get_contract_factory(abi_path: str, client: AsyncWeb3 | None = None) -> type[AsyncContract]:
+    """`client` is one of the execution endpoints, the first one by default."""
+    return (client or get_execution_client()).eth.contract(abi=get_abi(abi_path))
+
+
+@lru_cache(maxsize=settings.contract_cache_size)
+def get_contract(
+    abi_path: str, address: ChecksumAddress, client: AsyncWeb3 | None = None
+) -> AsyncContract:
+    return get_contract_factory(abi_path, client)(address=address)
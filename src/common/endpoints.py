@@ -1,7 +1,9 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 
 from src.common.app_state import AppState
-from src.common.schema import InfoResponse
+from src.common.metrics import get_metrics_registry
+from src.common.schema import InfoResponse, ReadyResponse
 from src.config import settings
 
 router = APIRouter()
@@ -14,3 +16,24 @@ async def get_info() -> InfoResponse:
         network=settings.network,
         validators_manager_address=app_state.validators_manager_account.address,
     )
+
+
+@router.get('/ready')
+async def get_ready(response: Response) -> ReadyResponse:
+    """Responds with status 503 until startup of all workers is complete."""
+    app_state = AppState()
+    if app_state.workers_ready is not None:
+        workers = len(app_state.workers_ready)
+        workers_ready = sum(app_state.workers_ready)
+    else:
+        workers, workers_ready = 1, int(app_state.ready)
+
+    ready = app_state.ready and workers_ready == workers
+    if not ready:
+        response.status_code = 503
+    return ReadyResponse(ready=ready, workers_ready=workers_ready, workers=workers)
+
+
+@router.get('/metrics')
+async def get_metrics() -> Response:
+    return Response(content=generate_latest(get_metrics_registry()), media_type=CONTENT_TYPE_LATEST)
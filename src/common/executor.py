@@ -0,0 +1,196 @@
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Callable, Generic, TypeVar
+
+from src.common.metrics import crypto_batch_jobs, observe_stages, run_collecting_stages
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+
+class CryptoQueueFullError(Exception):
+    pass
+
+
+class CryptoExecutor:
+    """
+    Runs CPU-bound jobs (key derivation, BLS signing) outside the event loop.
+    The number of queued and running jobs is limited by `settings.crypto_queue_size`.
+    """
+
+    def __init__(self) -> None:
+        self._executor: Executor | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+        self._running = 0
+
+    def start(self) -> None:
+        if settings.crypto_workers > 0:
+            self._executor = ProcessPoolExecutor(
+                max_workers=settings.crypto_workers,
+                mp_context=multiprocessing.get_context('spawn'),
+            )
+        logger.info('crypto workers: %s', settings.crypto_workers)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    async def warm_up(self, fn: Callable[[], Any]) -> None:
+        """
+        Runs `fn` as many times as there are workers, so every worker usually runs it once.
+        Spawned workers import their modules on the first job.
+        Stage durations of the warm-up are not reported.
+        """
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(
+            *(
+                loop.run_in_executor(self._executor, partial(run_collecting_stages, fn))
+                for _ in range(max(settings.crypto_workers, 1))
+            )
+        )
+
+    @property
+    def idle_workers(self) -> int:
+        """Workers without a job, at least one. Jobs run in threads without crypto workers."""
+        return max(settings.crypto_workers - self._running, 1)
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(settings.crypto_queue_size)
+        return self._semaphore
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        try:
+            await asyncio.wait_for(self.semaphore.acquire(), timeout=settings.crypto_queue_timeout)
+        except asyncio.TimeoutError as e:
+            raise CryptoQueueFullError('Crypto queue is full, try again later') from e
+
+        self._running += 1
+        try:
+            loop = asyncio.get_running_loop()
+            result, stages = await loop.run_in_executor(
+                self._executor, partial(run_collecting_stages, fn, *args, **kwargs)
+            )
+        finally:
+            self._running -= 1
+            self.semaphore.release()
+
+        observe_stages(stages)
+        return result
+
+
+@dataclass
+class _PendingJob(Generic[T]):
+    kwargs: dict[str, Any]
+    size: int
+    future: asyncio.Future[T]
+
+
+class BatchScheduler(Generic[T]):
+    """
+    Groups `fn` jobs of concurrent requests into one crypto executor job.
+    A batch is dispatched once it has `settings.crypto_batch_max_size` items
+    or `settings.crypto_batch_window` seconds after its first job, whichever comes first,
+    so a single request waits at most the window.
+    A dispatched batch is split between idle workers, so its jobs don't run one after another
+    while other workers wait.
+    """
+
+    def __init__(self, fn: Callable[..., T]) -> None:
+        self.fn = fn
+        self._pending: list[_PendingJob[T]] = []
+        self._pending_size = 0
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def run(self, size: int, **kwargs: Any) -> T:
+        """`size` is the number of items (e.g. validators) the job processes."""
+        if settings.crypto_batch_window <= 0 or size >= settings.crypto_batch_max_size:
+            return await crypto_executor.run(self.fn, **kwargs)
+
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[T] = loop.create_future()
+        self._pending.append(_PendingJob(kwargs=kwargs, size=size, future=future))
+        self._pending_size += size
+        if self._pending_size >= settings.crypto_batch_max_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(settings.crypto_batch_window, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, pending_size = self._pending, self._pending_size
+        self._pending, self._pending_size = [], 0
+
+        for batch in _split_batch(pending, pending_size, crypto_executor.idle_workers):
+            task = asyncio.create_task(self._run_batch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch: list[_PendingJob[T]]) -> None:
+        crypto_batch_jobs.observe(len(batch))
+        try:
+            results: list[T | Exception] = await crypto_executor.run(
+                run_batch, self.fn, [job.kwargs for job in batch]
+            )
+        except BaseException as e:
+            for job in batch:
+                if not job.future.done():
+                    job.future.set_exception(e)
+            return
+
+        for job, result in zip(batch, results):
+            future = job.future
+            if future.done():
+                # the request was cancelled
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+
+def _split_batch(
+    pending: list[_PendingJob[T]], pending_size: int, count: int
+) -> list[list[_PendingJob[T]]]:
+    """Splits jobs into at most `count` batches of about the same number of items."""
+    count = min(count, len(pending))
+    batches: list[list[_PendingJob[T]]] = []
+    batch: list[_PendingJob[T]] = []
+    batch_size = 0
+    for job in pending:
+        batch.append(job)
+        batch_size += job.size
+        # batches are closed once they reach their share of the remaining items
+        if len(batches) < count - 1 and batch_size * (count - len(batches)) >= pending_size:
+            batches.append(batch)
+            pending_size -= batch_size
+            batch, batch_size = [], 0
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def run_batch(fn: Callable[..., T], jobs: list[dict[str, Any]]) -> list[T | Exception]:
+    """Runs in crypto workers. A failed job doesn't affect other jobs of the batch."""
+    results: list[T | Exception] = []
+    for kwargs in jobs:
+        try:
+            results.append(fn(**kwargs))
+        except Exception as e:
+            results.append(e)
+    return results
+
+
+crypto_executor = CryptoExecutor()
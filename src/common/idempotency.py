@@ -0,0 +1,118 @@
+import asyncio
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from pydantic import BaseModel
+
+from src.common.app_state import AppState
+from src.common.metrics import idempotency_hits, idempotency_misses
+from src.config import settings
+
+
+class IdempotencyCache:
+    """
+    Stores signing responses by request and the on-chain state they were signed for,
+    so retried requests are answered without encoding and signing the payload again.
+    Once the state changes (e.g. nonce is incremented) the key changes as well.
+    Keys include the signer and the chain, so a shared database is never answered
+    with responses signed by another validators manager or for another network.
+
+    Responses are kept in memory, up to `settings.idempotency_cache_size` entries.
+    When `settings.idempotency_db_path` is set they are also stored in SQLite
+    to survive restarts and to be shared between server workers.
+    SQLite queries run in a thread, so the event loop isn't blocked by disk writes
+    and by locks held by other workers.
+    """
+
+    def __init__(self) -> None:
+        self._values: OrderedDict[str, str] = OrderedDict()
+        self._db: sqlite3.Connection | None = None
+        # one query at a time on the shared connection
+        self._db_lock = threading.Lock()
+
+    @staticmethod
+    def get_key(endpoint: str, request: BaseModel, state: int | str) -> str:
+        # request fields are hex strings and numbers, case is not significant
+        signer = AppState().validators_manager_account.address
+        chain_id = settings.network_config.CHAIN_ID
+        payload = (
+            f'{signer.lower()}:{chain_id}:{endpoint}:{state}:{request.model_dump_json().lower()}'
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    async def get(self, endpoint: str, key: str) -> str | None:
+        if settings.idempotency_cache_size <= 0:
+            return None
+
+        value = self._values.get(key)
+        if value is not None:
+            self._values.move_to_end(key)
+        elif settings.idempotency_db_path:
+            value = await asyncio.to_thread(self._select, key)
+            if value is not None:
+                self._set(key, value)
+
+        if value is None:
+            idempotency_misses.labels(endpoint).inc()
+        else:
+            idempotency_hits.labels(endpoint).inc()
+        return value
+
+    async def put(self, key: str, value: str) -> None:
+        if settings.idempotency_cache_size <= 0:
+            return
+
+        self._set(key, value)
+        if settings.idempotency_db_path:
+            await asyncio.to_thread(self._insert, key, value)
+
+    def close(self) -> None:
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _select(self, key: str) -> str | None:
+        with self._db_lock:
+            row = (
+                self._get_db()
+                .execute('SELECT value FROM responses WHERE key = ?', (key,))
+                .fetchone()
+            )
+        return row[0] if row else None
+
+    def _insert(self, key: str, value: str) -> None:
+        with self._db_lock, self._get_db() as db:
+            db.execute(
+                'INSERT OR REPLACE INTO responses (key, value, created_at) VALUES (?, ?, ?)',
+                (key, value, time.time()),
+            )
+            # rowid grows with every insert, keep the latest rows only
+            db.execute(
+                'DELETE FROM responses WHERE rowid <= (SELECT MAX(rowid) FROM responses) - ?',
+                (settings.idempotency_db_max_size,),
+            )
+
+    def _set(self, key: str, value: str) -> None:
+        self._values.pop(key, None)
+        self._values[key] = value
+        while len(self._values) > settings.idempotency_cache_size:
+            self._values.popitem(last=False)
+
+    def _get_db(self) -> sqlite3.Connection:
+        if self._db is None:
+            # queries run in threads of the default executor
+            self._db = sqlite3.connect(settings.idempotency_db_path, check_same_thread=False)
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute('PRAGMA synchronous=NORMAL')
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS responses '
+                '(key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)'
+            )
+        return self._db
+
+
+idempotency_cache = IdempotencyCache()
@@ -0,0 +1,180 @@
+import asyncio
+import glob
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, TypeVar
+
+from prometheus_client import (
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    multiprocess,
+)
+
+from src.config import settings
+
+T = TypeVar('T')
+
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+BATCH_SIZE_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+
+request_duration = Histogram(
+    'relayer_request_duration_seconds',
+    'HTTP request latency',
+    ['method', 'path', 'status'],
+    buckets=LATENCY_BUCKETS,
+)
+stage_duration = Histogram(
+    'relayer_stage_duration_seconds',
+    'Latency of request processing stages',
+    ['stage'],
+    buckets=LATENCY_BUCKETS,
+)
+rpc_duration = Histogram(
+    'relayer_rpc_duration_seconds',
+    'Latency of execution client calls',
+    ['method'],
+    buckets=LATENCY_BUCKETS,
+)
+batch_size = Histogram(
+    'relayer_batch_size',
+    'Number of validators in request',
+    ['endpoint'],
+    buckets=BATCH_SIZE_BUCKETS,
+)
+crypto_batch_jobs = Histogram(
+    'relayer_crypto_batch_jobs',
+    'Number of request jobs grouped in one crypto job',
+    buckets=BATCH_SIZE_BUCKETS,
+)
+# gauges of server workers are summed or labeled by pid in multiprocess mode
+event_loop_lag = Gauge(
+    'relayer_event_loop_lag_seconds', 'Event loop scheduling delay', multiprocess_mode='liveall'
+)
+
+key_pool_keys = Gauge(
+    'relayer_key_pool_keys', 'Number of pre-generated keys', multiprocess_mode='livesum'
+)
+key_pool_hits = Counter('relayer_key_pool_hits', 'Keys served from the key pool')
+key_pool_misses = Counter('relayer_key_pool_misses', 'Keys generated on request')
+key_pool_generated = Counter('relayer_key_pool_generated', 'Keys generated by the key pool')
+
+execution_endpoint_healthy = Gauge(
+    'relayer_execution_endpoint_healthy',
+    'Execution endpoint is used for reads',
+    ['endpoint'],
+    multiprocess_mode='liveall',
+)
+hedged_reads = Counter(
+    'relayer_hedged_reads', 'Reads also sent to the next endpoint after the hedge delay'
+)
+
+rpc_cache_hits = Counter('relayer_rpc_cache_hits', 'Contract reads served from the cache')
+rpc_cache_misses = Counter('relayer_rpc_cache_misses', 'Contract reads sent to the node')
+
+idempotency_hits = Counter(
+    'relayer_idempotency_hits', 'Signing requests answered with a stored response', ['endpoint']
+)
+idempotency_misses = Counter(
+    'relayer_idempotency_misses', 'Signing requests signed for the first time', ['endpoint']
+)
+
+keystore_queue_size = Gauge(
+    'relayer_keystore_queue_size', 'Keys waiting to be saved', multiprocess_mode='livesum'
+)
+stored_keystores = Counter('relayer_stored_keystores', 'Keys saved to the keystore store')
+
+admission_in_flight_validators = Gauge(
+    'relayer_admission_in_flight_validators',
+    'Validators admitted for generation',
+    multiprocess_mode='livesum',
+)
+admission_queued_validators = Gauge(
+    'relayer_admission_queued_validators',
+    'Validators waiting for admission',
+    multiprocess_mode='livesum',
+)
+admission_rejections = Counter(
+    'relayer_admission_rejections', 'Requests rejected by admission control', ['reason']
+)
+
+verified_validators = Counter(
+    'relayer_verified_validators', 'Validators with verified deposit and exit signatures'
+)
+
+
+def is_multiprocess_mode() -> bool:
+    """Server workers write metrics to files in `PROMETHEUS_MULTIPROC_DIR`."""
+    return bool(os.environ.get('PROMETHEUS_MULTIPROC_DIR'))
+
+
+def get_metrics_registry() -> CollectorRegistry:
+    """Metrics of all server workers in multiprocess mode, of the current process otherwise."""
+    if not is_multiprocess_mode():
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def clear_multiprocess_dir() -> None:
+    """Removes metrics files of previous runs, files of the current process are kept."""
+    suffix = f'_{os.getpid()}.db'
+    for path in glob.glob(os.path.join(os.environ['PROMETHEUS_MULTIPROC_DIR'], '*.db')):
+        if not path.endswith(suffix):
+            os.remove(path)
+
+
+def mark_worker_dead(pid: int) -> None:
+    if is_multiprocess_mode():
+        multiprocess.mark_process_dead(pid)
+
+
+# Crypto jobs run in worker processes, where observations can't reach /metrics.
+# Stage durations measured there are collected and observed by the caller.
+_worker_state = threading.local()
+
+
+@contextmanager
+def stage_timer(stage: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_stage(stage, time.perf_counter() - start)
+
+
+def observe_stage(stage: str, seconds: float) -> None:
+    collected = getattr(_worker_state, 'stages', None)
+    if collected is not None:
+        collected.append((stage, seconds))
+        return
+    stage_duration.labels(stage).observe(seconds)
+
+
+def run_collecting_stages(
+    fn: Callable[..., T], *args: Any, **kwargs: Any
+) -> tuple[T, list[tuple[str, float]]]:
+    """Runs in crypto workers. Returns the result and durations of the stages."""
+    _worker_state.stages = []
+    try:
+        return fn(*args, **kwargs), _worker_state.stages
+    finally:
+        _worker_state.stages = None
+
+
+def observe_stages(stages: list[tuple[str, float]]) -> None:
+    for stage, seconds in stages:
+        stage_duration.labels(stage).observe(seconds)
+
+
+async def monitor_event_loop_lag() -> None:
+    interval = settings.metrics_loop_lag_interval
+    while True:
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        event_loop_lag.set(max(time.perf_counter() - start - interval, 0))
@@ -0,0 +1,15 @@
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic_core import to_json
+
+
+class PydanticJSONResponse(JSONResponse):
+    """
+    Renders pydantic models straight to JSON bytes with pydantic-core.
+    Endpoints returning it skip response model validation and `jsonable_encoder`,
+    which are slow for large payloads.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
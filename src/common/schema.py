@@ -4,3 +4,9 @@ from pydantic import BaseModel
 class InfoResponse(BaseModel):
     network: str
     validators_manager_address: str
+
+
+class ReadyResponse(BaseModel):
+    ready: bool
+    workers_ready: int
+    workers: int
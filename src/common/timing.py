@@ -0,0 +1,24 @@
+import time
+from typing import Awaitable, TypeVar
+
+T = TypeVar('T')
+
+
+class Spans:
+    """Records start and end of request stages relative to the request start."""
+
+    def __init__(self) -> None:
+        self.started_at = time.perf_counter()
+        self.spans: dict[str, tuple[float, float]] = {}
+
+    async def track(self, name: str, awaitable: Awaitable[T]) -> T:
+        start = time.perf_counter() - self.started_at
+        try:
+            return await awaitable
+        finally:
+            self.spans[name] = start, time.perf_counter() - self.started_at
+
+    def __str__(self) -> str:
+        return ', '.join(
+            f'{name} {start:.3f}-{end:.3f}s' for name, (start, end) in self.spans.items()
+        )
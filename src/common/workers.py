@@ -0,0 +1,170 @@
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import sys
+import time
+from types import FrameType
+from typing import NoReturn
+
+import uvicorn
+from fastapi import FastAPI
+
+from src.common.app_state import AppState
+from src.common.metrics import (
+    clear_multiprocess_dir,
+    is_multiprocess_mode,
+    mark_worker_dead,
+)
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+# exit code of a worker which failed to start, the same as uvicorn uses
+STARTUP_FAILURE_EXIT_CODE = 3
+# max seconds between restarts of a crashing worker
+MAX_RESTART_DELAY = 60
+
+
+def run_workers(app: FastAPI) -> None:
+    """
+    Serves the app with `settings.relayer_workers` forked processes sharing one socket.
+    The validators manager account must be loaded into `AppState` before,
+    workers inherit it in memory, so the keystore is decrypted only once.
+    Metrics of all workers are served when `PROMETHEUS_MULTIPROC_DIR` is set.
+    """
+    app_state = AppState()
+    if is_multiprocess_mode():
+        clear_multiprocess_dir()
+    else:
+        logger.warning(
+            'PROMETHEUS_MULTIPROC_DIR is not set, /metrics responds with metrics of one worker'
+        )
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((settings.relayer_host, settings.relayer_port))
+    sock.listen(2048)
+
+    # readiness flags shared by all workers, see `/ready`
+    app_state.workers_ready = multiprocessing.RawArray('b', settings.relayer_workers)
+
+    supervisor = WorkerSupervisor(app, sock)
+    signal.signal(signal.SIGTERM, supervisor.shutdown)
+    signal.signal(signal.SIGINT, supervisor.shutdown)
+    supervisor.run()
+    sock.close()
+    if supervisor.failed:
+        sys.exit(1)
+
+
+class WorkerSupervisor:
+    """
+    Restarts crashed workers after `settings.relayer_worker_restart_delay` seconds,
+    doubled on every restart of the worker, at most `settings.relayer_worker_max_restarts` times.
+    Workers exited with status 0 are not restarted. All workers are stopped
+    when a worker dies before it is ready, e.g. on invalid configuration, or restarts too often.
+    """
+
+    def __init__(self, app: FastAPI, sock: socket.socket) -> None:
+        self.app = app
+        self.sock = sock
+        # worker indexes by pid
+        self.workers: dict[int, int] = {}
+        self.restarts = [0] * settings.relayer_workers
+        self.shutting_down = False
+        self.failed = False
+
+    def run(self) -> None:
+        for worker_index in range(settings.relayer_workers):
+            self._start(worker_index)
+
+        while self.workers:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            if pid not in self.workers:
+                continue
+            worker_index = self.workers.pop(pid)
+            mark_worker_dead(pid)
+            if not self.shutting_down:
+                self._on_exit(worker_index, os.waitstatus_to_exitcode(status))
+
+    def shutdown(self, _signum: int, _frame: FrameType | None) -> None:
+        self.stop()
+
+    def stop(self) -> None:
+        self.shutting_down = True
+        for pid in self.workers:
+            os.kill(pid, signal.SIGTERM)
+
+    def _on_exit(self, worker_index: int, exit_code: int) -> None:
+        app_state = AppState()
+        if not app_state.workers_ready[worker_index]:
+            logger.error(
+                'worker %d exited with code %d before it was ready, stopping',
+                worker_index,
+                exit_code,
+            )
+            self._fail()
+            return
+        if exit_code == 0:
+            logger.warning('worker %d exited', worker_index)
+            return
+        if self.restarts[worker_index] >= settings.relayer_worker_max_restarts:
+            logger.error(
+                'worker %d exited with code %d after %d restarts, stopping',
+                worker_index,
+                exit_code,
+                self.restarts[worker_index],
+            )
+            self._fail()
+            return
+
+        delay = min(
+            settings.relayer_worker_restart_delay * 2 ** self.restarts[worker_index],
+            MAX_RESTART_DELAY,
+        )
+        self.restarts[worker_index] += 1
+        logger.error(
+            'worker %d exited with code %d, restarting in %.1fs', worker_index, exit_code, delay
+        )
+        app_state.workers_ready[worker_index] = 0
+        # other workers keep serving, a shutdown signal interrupts the delay
+        deadline = time.monotonic() + delay
+        while not self.shutting_down and time.monotonic() < deadline:
+            time.sleep(0.1)
+        if not self.shutting_down:
+            self._start(worker_index)
+
+    def _start(self, worker_index: int) -> None:
+        self.workers[_fork_worker(self.app, self.sock, worker_index)] = worker_index
+
+    def _fail(self) -> None:
+        self.failed = True
+        self.stop()
+
+
+def _fork_worker(app: FastAPI, sock: socket.socket, worker_index: int) -> int:
+    pid = os.fork()
+    if not pid:
+        _run_worker(app, sock, worker_index)
+    return pid
+
+
+def _run_worker(app: FastAPI, sock: socket.socket, worker_index: int) -> NoReturn:
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    AppState().worker_index = worker_index
+    server = uvicorn.Server(uvicorn.Config(app))
+    try:
+        server.run(sockets=[sock])
+    except SystemExit:
+        # uvicorn exits when the lifespan startup fails
+        pass
+    except Exception as e:
+        logger.exception('worker %d failed: %s', worker_index, e)
+        os._exit(1)  # pylint: disable=protected-access
+    # the process must not return into the code of the master
+    os._exit(0 if server.started else STARTUP_FAILURE_EXIT_CODE)  # pylint: disable=protected-access
@@ -1,9 +1,19 @@
-from decouple import config
+import os
+
+from decouple import Csv, config
 
 from src.config.networks import NETWORKS
 
 relayer_host: str = config('RELAYER_HOST', default='127.0.0.1')
 relayer_port: int = config('RELAYER_PORT', cast=int, default=8000)
+# number of server processes, each process starts its own crypto workers
+relayer_workers: int = config('RELAYER_WORKERS', cast=int, default=1)
+# seconds before a crashed server worker is restarted, doubled on every restart of the worker
+relayer_worker_restart_delay: float = config('RELAYER_WORKER_RESTART_DELAY', cast=float, default=1)
+# the master exits when a server worker crashes more times
+relayer_worker_max_restarts: int = config('RELAYER_WORKER_MAX_RESTARTS', cast=int, default=5)
+# CPUs of the machine are shared by crypto and keystore workers of all server workers
+cpus_per_relayer_worker = max((os.cpu_count() or 1) // max(relayer_workers, 1), 1)
 
 validators_manager_key_file: str = config('VALIDATORS_MANAGER_KEY_FILE')
 validators_manager_password_file: str = config('VALIDATORS_MANAGER_PASSWORD_FILE')
@@ -11,9 +21,118 @@ validators_manager_password_file: str = config('VALIDATORS_MANAGER_PASSWORD_FILE
 network: str = config('NETWORK')
 network_config = NETWORKS[network]
 
-execution_endpoint: str = config('EXECUTION_ENDPOINT')
+# comma-separated, a single EXECUTION_ENDPOINT is still supported
+execution_endpoints: list[str] = config('EXECUTION_ENDPOINTS', cast=Csv(), default='') or [
+    config('EXECUTION_ENDPOINT')
+]
 execution_timeout: int = config('EXECUTION_TIMEOUT', cast=int, default=60)
 execution_retry_timeout: int = config('EXECUTION_RETRY_TIMEOUT', cast=int, default=60)
+# percentile of the endpoint latencies after which a read is also sent to the next endpoint,
+# 0 disables hedging
+execution_hedge_percentile: float = config('EXECUTION_HEDGE_PERCENTILE', cast=float, default=95)
+# hedge delay in seconds until enough latencies of the endpoint are measured
+execution_hedge_delay: float = config('EXECUTION_HEDGE_DELAY', cast=float, default=0.2)
+# seconds between block number checks of the endpoints
+execution_health_check_interval: float = config(
+    'EXECUTION_HEALTH_CHECK_INTERVAL', cast=float, default=5
+)
+# endpoints behind the highest block number by more blocks are not used for reads
+execution_max_block_lag: int = config('EXECUTION_MAX_BLOCK_LAG', cast=int, default=2)
+
+# seconds to cache registry root and vault nonce reads, 0 disables the cache
+rpc_cache_ttl: float = config('RPC_CACHE_TTL', cast=float, default=1)
+rpc_cache_max_size: int = config('RPC_CACHE_MAX_SIZE', cast=int, default=1024)
+
+# max number of contract objects cached by address
+contract_cache_size: int = config('CONTRACT_CACHE_SIZE', cast=int, default=1024)
+# max number of cached EIP-712 domain separators by chain id and vault
+eip712_domain_cache_size: int = config('EIP712_DOMAIN_CACHE_SIZE', cast=int, default=1024)
+
+# crypto workers
+# number of processes used for key derivation and BLS signing,
+# 0 runs crypto jobs in the default thread pool of the event loop
+crypto_workers: int = config('CRYPTO_WORKERS', cast=int, default=cpus_per_relayer_worker)
+# max number of validators generated by a single crypto job
+crypto_chunk_size: int = config('CRYPTO_CHUNK_SIZE', cast=int, default=16)
+# max number of crypto jobs queued or running at the same time
+crypto_queue_size: int = config('CRYPTO_QUEUE_SIZE', cast=int, default=256)
+# seconds to wait for a free queue slot before rejecting the request
+crypto_queue_timeout: float = config('CRYPTO_QUEUE_TIMEOUT', cast=float, default=10)
+# seconds to collect small jobs of concurrent requests into one crypto job, 0 disables batching
+crypto_batch_window: float = config('CRYPTO_BATCH_WINDOW', cast=float, default=0.005)
+# max number of validators in a batch of small jobs
+crypto_batch_max_size: int = config('CRYPTO_BATCH_MAX_SIZE', cast=int, default=16)
+
+# admission control
+# max number of validators in a /register request
+register_max_batch_size: int = config('REGISTER_MAX_BATCH_SIZE', cast=int, default=1000)
+# max number of validators in /fund, /withdraw and /consolidate requests
+signing_max_batch_size: int = config('SIGNING_MAX_BATCH_SIZE', cast=int, default=10000)
+# max number of validators generated at the same time, 0 disables admission control
+admission_max_validators: int = config('ADMISSION_MAX_VALIDATORS', cast=int, default=1024)
+# max number of validators queued per vault, requests over the limit are rejected with 429
+admission_vault_queue_size: int = config('ADMISSION_VAULT_QUEUE_SIZE', cast=int, default=2000)
+# queue delay in seconds, new requests are rejected with 503 while the queue is slower
+admission_queue_target: float = config('ADMISSION_QUEUE_TARGET', cast=float, default=2)
+# seconds a queued request waits for admission before it is rejected with 503
+admission_queue_timeout: float = config('ADMISSION_QUEUE_TIMEOUT', cast=float, default=10)
+
+# key pool
+# pre-generated credentials per vault and validator type
+key_pool_enabled: bool = config('KEY_POOL_ENABLED', cast=bool, default=False)
+# vaults to keep the pools for, other vaults are not pooled
+key_pool_vaults: list[str] = config('KEY_POOL_VAULTS', cast=Csv(), default='')
+# refill starts when the pool size drops below the low watermark
+key_pool_low_watermark: int = config('KEY_POOL_LOW_WATERMARK', cast=int, default=50)
+# refill stops when the pool size reaches the high watermark
+key_pool_high_watermark: int = config('KEY_POOL_HIGH_WATERMARK', cast=int, default=200)
+# seconds between pool stats log records, 0 disables logging
+key_pool_metrics_interval: int = config('KEY_POOL_METRICS_INTERVAL', cast=int, default=60)
+
+# max number of intermediate EIP-2333 keys cached during derivation
+derivation_cache_size: int = config('DERIVATION_CACHE_SIZE', cast=int, default=1024)
+
+# derive keys from the mnemonic instead of random root keys, empty file disables it
+key_mnemonic_file: str = config('KEY_MNEMONIC_FILE', default='')
+# SQLite file with allocated key indexes
+key_index_db_path: str = config('KEY_INDEX_DB_PATH', default='key-indexes.db')
+
+# keystores of generated validators, empty path disables saving
+KEYSTORE_KDF_SCRYPT = 'scrypt'
+KEYSTORE_KDF_PBKDF2 = 'pbkdf2'
+
+keystore_store_path: str = config('KEYSTORE_STORE_PATH', default='')
+keystore_password_file: str = config('KEYSTORE_PASSWORD_FILE', default='keystore-password.txt')
+keystore_kdf: str = config('KEYSTORE_KDF', default=KEYSTORE_KDF_SCRYPT)
+keystore_workers: int = config('KEYSTORE_WORKERS', cast=int, default=cpus_per_relayer_worker)
+keystore_batch_size: int = config('KEYSTORE_BATCH_SIZE', cast=int, default=16)
+# max number of keys waiting for encryption, /register waits when the queue is full
+keystore_queue_size: int = config('KEYSTORE_QUEUE_SIZE', cast=int, default=256)
+# seconds to wait on shutdown until queued keys are saved
+keystore_stop_timeout: float = config('KEYSTORE_STOP_TIMEOUT', cast=float, default=60)
+
+# responses of /fund, /withdraw and /consolidate stored for retried requests
+idempotency_cache_size: int = config('IDEMPOTENCY_CACHE_SIZE', cast=int, default=10000)
+# SQLite file to keep stored responses across restarts, empty to keep them in memory only
+idempotency_db_path: str = config('IDEMPOTENCY_DB_PATH', default='')
+idempotency_db_max_size: int = config('IDEMPOTENCY_DB_MAX_SIZE', cast=int, default=100000)
+
+# verify deposit and exit signatures before returning them
+verify_signatures: bool = config('VERIFY_SIGNATURES', cast=bool, default=False)
+
+# derive a key, sign and load contracts before reporting ready
+warm_up_enabled: bool = config('WARM_UP_ENABLED', cast=bool, default=True)
+
+# bls
+BLS_BACKEND_MILAGRO = 'milagro'
+BLS_BACKEND_PY_ECC = 'py_ecc'
+
+# milagro falls back to py_ecc when the native binding is not available
+bls_backend: str = config('BLS_BACKEND', default=BLS_BACKEND_MILAGRO)
+
+# metrics
+# seconds between event loop lag measurements
+metrics_loop_lag_interval: float = config('METRICS_LOOP_LAG_INTERVAL', cast=float, default=1)
 
 # logging
 LOG_PLAIN = 'plain'
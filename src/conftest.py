@@ -0,0 +1,7 @@
+import os
+
+# settings required on import, tests don't read the files or the endpoint
+os.environ.setdefault('NETWORK', 'hoodi')
+os.environ.setdefault('VALIDATORS_MANAGER_KEY_FILE', 'validators-manager-key.json')
+os.environ.setdefault('VALIDATORS_MANAGER_PASSWORD_FILE', 'validators-manager-password.txt')
+os.environ.setdefault('EXECUTION_ENDPOINT', 'http://localhost:8545')
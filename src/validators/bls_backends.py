@@ -0,0 +1,126 @@
+import importlib
+import logging
+from abc import ABC, abstractmethod
+from functools import cache
+from typing import Any, Sequence
+
+from eth_typing import BLSPrivateKey, BLSPubkey, BLSSignature
+
+from src.config import settings
+from src.config.settings import BLS_BACKEND_MILAGRO, BLS_BACKEND_PY_ECC
+
+logger = logging.getLogger(__name__)
+
+
+class BLSBackend(ABC):
+    """
+    The implementation module is imported when the backend is created,
+    so unused backends are never loaded.
+    """
+
+    name: str = ''
+    module: str = ''
+
+    def __init__(self) -> None:
+        self._impl: Any = importlib.import_module(self.module)
+
+    @abstractmethod
+    def sk_to_pk(self, private_key: BLSPrivateKey) -> BLSPubkey:
+        ...
+
+    @abstractmethod
+    def sign(self, private_key: BLSPrivateKey, message: bytes) -> BLSSignature:
+        ...
+
+    @abstractmethod
+    def verify(self, public_key: bytes, message: bytes, signature: bytes) -> bool:
+        ...
+
+    @abstractmethod
+    def aggregate(self, signatures: Sequence[bytes]) -> BLSSignature:
+        ...
+
+    @abstractmethod
+    def aggregate_verify(
+        self, public_keys: Sequence[bytes], messages: Sequence[bytes], signature: bytes
+    ) -> bool:
+        """Verifies aggregated signature of distinct messages."""
+
+
+class MilagroBackend(BLSBackend):
+    """Native BLS implementation, used by default."""
+
+    name = BLS_BACKEND_MILAGRO
+    module = 'milagro_bls_binding'
+
+    def sk_to_pk(self, private_key: BLSPrivateKey) -> BLSPubkey:
+        return BLSPubkey(self._impl.SkToPk(_to_bytes(private_key)))
+
+    def sign(self, private_key: BLSPrivateKey, message: bytes) -> BLSSignature:
+        return BLSSignature(self._impl.Sign(_to_bytes(private_key), message))
+
+    def verify(self, public_key: bytes, message: bytes, signature: bytes) -> bool:
+        return self._impl.Verify(public_key, message, signature)
+
+    def aggregate(self, signatures: Sequence[bytes]) -> BLSSignature:
+        return BLSSignature(self._impl.Aggregate(list(signatures)))
+
+    def aggregate_verify(
+        self, public_keys: Sequence[bytes], messages: Sequence[bytes], signature: bytes
+    ) -> bool:
+        return self._impl.AggregateVerify(list(public_keys), list(messages), signature)
+
+
+class PyEccBackend(BLSBackend):
+    """Pure-Python BLS implementation, several orders of magnitude slower than milagro."""
+
+    name = BLS_BACKEND_PY_ECC
+    module = 'py_ecc.bls'
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._impl = self._impl.G2ProofOfPossession
+
+    def sk_to_pk(self, private_key: BLSPrivateKey) -> BLSPubkey:
+        return self._impl.SkToPk(private_key)
+
+    def sign(self, private_key: BLSPrivateKey, message: bytes) -> BLSSignature:
+        return self._impl.Sign(private_key, message)
+
+    def verify(self, public_key: bytes, message: bytes, signature: bytes) -> bool:
+        return self._impl.Verify(BLSPubkey(public_key), message, BLSSignature(signature))
+
+    def aggregate(self, signatures: Sequence[bytes]) -> BLSSignature:
+        return self._impl.Aggregate([BLSSignature(s) for s in signatures])
+
+    def aggregate_verify(
+        self, public_keys: Sequence[bytes], messages: Sequence[bytes], signature: bytes
+    ) -> bool:
+        return self._impl.AggregateVerify(
+            [BLSPubkey(pk) for pk in public_keys], list(messages), BLSSignature(signature)
+        )
+
+
+BLS_BACKENDS: dict[str, type[BLSBackend]] = {
+    BLS_BACKEND_MILAGRO: MilagroBackend,
+    BLS_BACKEND_PY_ECC: PyEccBackend,
+}
+
+
+@cache
+def get_bls_backend(name: str | None = None) -> BLSBackend:
+    name = name or settings.bls_backend
+    if name not in BLS_BACKENDS:
+        raise ValueError(f'Unknown BLS backend: {name}')
+
+    try:
+        return BLS_BACKENDS[name]()
+    except ImportError:
+        if name != BLS_BACKEND_MILAGRO:
+            raise
+        logger.warning('milagro_bls_binding is not available, falling back to py_ecc')
+        return BLS_BACKENDS[BLS_BACKEND_PY_ECC]()
+
+
+def _to_bytes(private_key: BLSPrivateKey) -> bytes:
+    return private_key.to_bytes(32, 'big')
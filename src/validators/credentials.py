@@ -1,25 +1,15 @@
 import secrets
-from dataclasses import dataclass
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from functools import cached_property
 
-import milagro_bls_binding as bls
-from eth_typing import BLSPrivateKey, ChecksumAddress, HexStr
-from py_ecc.bls import G2ProofOfPossession
-from py_ecc.optimized_bls12_381.optimized_curve import curve_order
-from staking_deposit.key_handling.key_derivation.path import path_to_nodes
-from staking_deposit.key_handling.key_derivation.tree import derive_child_SK
-from staking_deposit.settings import DEPOSIT_CLI_VERSION
+from eth_typing import BLSPrivateKey, BLSPubkey, ChecksumAddress
 from sw_utils import get_v1_withdrawal_credentials, get_v2_withdrawal_credentials
-from sw_utils.signing import (
-    DepositData,
-    DepositMessage,
-    compute_deposit_domain,
-    compute_signing_root,
-)
 from sw_utils.typings import Bytes32
-from web3 import Web3
 
-from src.config.networks import NETWORKS
+from src.common.metrics import stage_timer
+from src.config import settings
+from src.validators.bls_backends import get_bls_backend
 from src.validators.typings import ValidatorType
 
 # Set path as EIP-2334 format
@@ -41,12 +31,9 @@ class Credential:
     amount: int | None = None
 
     @cached_property
-    def public_key(self) -> HexStr:
-        return Web3.to_hex(G2ProofOfPossession.SkToPk(self.private_key))
-
-    @cached_property
-    def private_key_bytes(self) -> bytes:
-        return self.private_key.to_bytes(32, 'big')
+    def public_key(self) -> BLSPubkey:
+        with stage_timer('sk_to_pk'):
+            return get_bls_backend().sk_to_pk(self.private_key)
 
     @cached_property
     def withdrawal_credentials(self) -> Bytes32:
@@ -54,36 +41,64 @@ class Credential:
             return get_v1_withdrawal_credentials(self.vault)
         return get_v2_withdrawal_credentials(self.vault)
 
-    def get_deposit_message(self, amount: int) -> DepositMessage:
-        return DepositMessage(
-            pubkey=Web3.to_bytes(hexstr=self.public_key),
-            withdrawal_credentials=self.withdrawal_credentials,
-            amount=amount,
-        )
 
-    def get_deposit_datum_dict(self, amount: int) -> dict[str, bytes]:
-        signed_deposit_datum = self.get_signed_deposit(amount)
-        fork_version = NETWORKS[self.network].GENESIS_FORK_VERSION
-        datum_dict = signed_deposit_datum.as_dict()
-        deposit_message = self.get_deposit_message(amount)
-        datum_dict.update({'deposit_message_root': deposit_message.hash_tree_root})
-        datum_dict.update({'deposit_data_root': signed_deposit_datum.hash_tree_root})
-        datum_dict.update({'fork_version': fork_version})
-        datum_dict.update({'network_name': self.network})
-        datum_dict.update({'deposit_cli_version': DEPOSIT_CLI_VERSION})
-        return datum_dict
-
-    def get_signed_deposit(self, amount: int) -> DepositData:
-        fork_version = NETWORKS[self.network].GENESIS_FORK_VERSION
-        domain = compute_deposit_domain(fork_version)
-        deposit_message = self.get_deposit_message(amount)
-        signing_root = compute_signing_root(deposit_message, domain)
-        signed_deposit = DepositData(
-            **deposit_message.as_dict(),
-            # pylint: disable-next=no-member
-            signature=bls.Sign(self.private_key_bytes, signing_root),
-        )
-        return signed_deposit
+@dataclass
+class ValidatorKeys:
+    """
+    Keys of validators being generated. Pre-generated `credentials` are used first,
+    the missing keys are derived from the mnemonic starting at `start_index` when it is set,
+    from a random root key otherwise.
+    """
+
+    credentials: list[Credential] = field(default_factory=list)
+    start_index: int | None = None
+
+
+class DerivationTree:
+    """
+    Derives EIP-2333 keys from the root key.
+    Intermediate nodes are kept in LRU cache, so paths sharing a prefix
+    (e.g. `m/12381/3600`) derive only the nodes that are not cached yet.
+    """
+
+    def __init__(self, root_key: BLSPrivateKey, cache_size: int | None = None):
+        self.root_key = root_key
+        self.cache_size = settings.derivation_cache_size if cache_size is None else cache_size
+        self._cache: OrderedDict[tuple[int, ...], BLSPrivateKey] = OrderedDict()
+
+    @stage_timer('key_derivation')
+    def derive(self, path: str) -> BLSPrivateKey:
+        # pylint: disable=import-outside-toplevel
+        from staking_deposit.key_handling.key_derivation.path import path_to_nodes
+        from staking_deposit.key_handling.key_derivation.tree import derive_child_SK
+
+        nodes = tuple(path_to_nodes(path))
+        cached_depth, private_key = self._get_cached_prefix(nodes)
+
+        for depth in range(cached_depth + 1, len(nodes) + 1):
+            private_key = BLSPrivateKey(
+                derive_child_SK(parent_SK=private_key, index=nodes[depth - 1])
+            )
+            # leaf keys are not shared with other paths
+            if depth < len(nodes):
+                self._put(nodes[:depth], private_key)
+
+        return private_key
+
+    def _get_cached_prefix(self, nodes: tuple[int, ...]) -> tuple[int, BLSPrivateKey]:
+        for depth in range(len(nodes) - 1, 0, -1):
+            private_key = self._cache.get(nodes[:depth])
+            if private_key is not None:
+                self._cache.move_to_end(nodes[:depth])
+                return depth, private_key
+        return 0, self.root_key
+
+    def _put(self, prefix: tuple[int, ...], private_key: BLSPrivateKey) -> None:
+        if self.cache_size <= 0:
+            return
+        self._cache[prefix] = private_key
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
 
 
 class CredentialManager:
@@ -91,17 +106,20 @@ class CredentialManager:
     def generate_credentials(
         count: int,
         start_index: int,
-        network: str,
         vault_address: ChecksumAddress,
         validator_type: ValidatorType,
+        tree: DerivationTree | None = None,
     ) -> list[Credential]:
+        """Keys are derived from a random root key unless the `tree` is passed."""
+        # pylint: disable=import-outside-toplevel
+        from py_ecc.optimized_bls12_381.optimized_curve import curve_order
+
         credentials = []
-        private_key = BLSPrivateKey(secrets.randbelow(curve_order))
+        tree = tree or DerivationTree(BLSPrivateKey(secrets.randbelow(curve_order)))
         for index in range(start_index, start_index + count):
             credential = CredentialManager._generate_credential(
-                network=network,
                 vault=vault_address,
-                private_key=private_key,
+                tree=tree,
                 index=index,
                 validator_type=validator_type,
             )
@@ -110,22 +128,17 @@ class CredentialManager:
 
     @staticmethod
     def _generate_credential(
-        network: str,
         vault: ChecksumAddress,
-        private_key: BLSPrivateKey,
+        tree: DerivationTree,
         index: int,
         validator_type: ValidatorType,
     ) -> Credential:
         signing_key_path = f'm/{PURPOSE}/{COIN_TYPE}/{index}/0/0'
-        nodes = path_to_nodes(signing_key_path)
-
-        for node in nodes:
-            private_key = BLSPrivateKey(derive_child_SK(parent_SK=private_key, index=node))
 
         return Credential(
-            private_key=private_key,
+            private_key=tree.derive(signing_key_path),
             path=signing_key_path,
-            network=network,
+            network=settings.network,
             vault=vault,
             validator_type=validator_type,
         )
@@ -0,0 +1,59 @@
+from hashlib import sha256
+from typing import Sequence
+
+from eth_typing import BLSSignature
+from sw_utils.typings import Bytes32
+
+from src.validators.typings import PUBLIC_KEY_LENGTH, SIGNATURE_LENGTH, check_length
+
+CHUNK_LENGTH = 32
+ZERO_CHUNK = bytes(CHUNK_LENGTH)
+# 48 bytes of the public key are packed into 2 chunks, the second one is zero-padded
+PUBLIC_KEY_PADDING = bytes(2 * CHUNK_LENGTH - PUBLIC_KEY_LENGTH)
+EMPTY_SIGNATURE = BLSSignature(bytes(SIGNATURE_LENGTH))
+
+
+def get_deposit_data_roots(
+    public_keys: Sequence[bytes],
+    withdrawal_credentials: bytes,
+    amounts: Sequence[int],
+    signature: bytes = EMPTY_SIGNATURE,
+) -> list[Bytes32]:
+    """
+    Computes `DepositData.hash_tree_root` for a batch of deposits
+    sharing withdrawal credentials and signature, without building SSZ objects.
+
+    DepositData leaves: pubkey root, withdrawal credentials, amount, signature root.
+    Signature root and the right subtree of every amount are computed once per batch.
+    """
+    check_length(withdrawal_credentials, CHUNK_LENGTH)
+    signature_root = get_signature_root(signature)
+    amount_nodes: dict[int, bytes] = {}
+    roots = []
+    for public_key, amount in zip(public_keys, amounts):
+        public_key_root = get_public_key_root(public_key)
+        amount_node = amount_nodes.get(amount)
+        if amount_node is None:
+            amount_node = sha256(get_uint64_leaf(amount) + signature_root).digest()
+            amount_nodes[amount] = amount_node
+
+        left = sha256(public_key_root + withdrawal_credentials).digest()
+        roots.append(Bytes32(sha256(left + amount_node).digest()))
+    return roots
+
+
+def get_public_key_root(public_key: bytes) -> bytes:
+    check_length(public_key, PUBLIC_KEY_LENGTH)
+    return sha256(public_key + PUBLIC_KEY_PADDING).digest()
+
+
+def get_signature_root(signature: bytes) -> bytes:
+    # 96 bytes are packed into 3 chunks, padded with a zero chunk to 4 leaves
+    check_length(signature, SIGNATURE_LENGTH)
+    left = sha256(signature[:64]).digest()
+    right = sha256(signature[64:] + ZERO_CHUNK).digest()
+    return sha256(left + right).digest()
+
+
+def get_uint64_leaf(value: int) -> bytes:
+    return value.to_bytes(8, 'little') + ZERO_CHUNK[8:]
@@ -0,0 +1,57 @@
+from functools import lru_cache
+
+from eth_account.signers.local import LocalAccount
+from eth_typing import ChecksumAddress, HexStr
+from eth_utils import keccak
+from web3 import Web3
+
+from src.config import settings
+
+# EIP-712 hashes of the `VaultValidators` message
+# https://eips.ethereum.org/EIPS/eip-712
+EIP712_DOMAIN_TYPE_HASH = keccak(
+    text='EIP712Domain(string name,string version,uint256 chainId,address verifyingContract)'
+)
+VAULT_VALIDATORS_TYPE_HASH = keccak(
+    text='VaultValidators(bytes32 validatorsRegistryRoot,bytes validators)'
+)
+DOMAIN_NAME_HASH = keccak(text='VaultValidators')
+DOMAIN_VERSION_HASH = keccak(text='1')
+
+
+@lru_cache(maxsize=settings.eip712_domain_cache_size)
+def get_domain_separator(chain_id: int, vault: ChecksumAddress) -> bytes:
+    return keccak(
+        EIP712_DOMAIN_TYPE_HASH
+        + DOMAIN_NAME_HASH
+        + DOMAIN_VERSION_HASH
+        + chain_id.to_bytes(32, byteorder='big')
+        + Web3.to_bytes(hexstr=vault).rjust(32, b'\x00')
+    )
+
+
+def get_vault_validators_hash(
+    chain_id: int, vault: ChecksumAddress, validators_registry_root: bytes, validators: bytes
+) -> bytes:
+    """Same digest as `encode_typed_data` for the `VaultValidators` message, signed as is."""
+    if len(validators_registry_root) != 32:
+        raise ValueError('validatorsRegistryRoot must be 32 bytes')
+
+    struct_hash = keccak(VAULT_VALIDATORS_TYPE_HASH + validators_registry_root + keccak(validators))
+    return keccak(b'\x19\x01' + get_domain_separator(chain_id, vault) + struct_hash)
+
+
+def sign_vault_validators(
+    account: LocalAccount,
+    vault: ChecksumAddress,
+    validators_registry_root: bytes,
+    validators: bytes,
+) -> HexStr:
+    message_hash = get_vault_validators_hash(
+        chain_id=settings.network_config.CHAIN_ID,
+        vault=vault,
+        validators_registry_root=validators_registry_root,
+        validators=validators,
+    )
+    signed_msg = account.unsafe_sign_hash(message_hash)
+    return HexStr(signed_msg.signature.hex())
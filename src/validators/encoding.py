@@ -0,0 +1,96 @@
+import struct
+from typing import Sequence
+
+from web3.types import Gwei
+
+from src.validators.typings import (
+    PUBLIC_KEY_LENGTH,
+    ROOT_LENGTH,
+    SIGNATURE_LENGTH,
+    Validator,
+    ValidatorBatch,
+    ValidatorType,
+    check_length,
+)
+
+AMOUNT_LENGTH = 8
+
+# fixed-width records signed by the validators manager
+V1_VALIDATOR_RECORD = struct.Struct(f'>{PUBLIC_KEY_LENGTH}s{SIGNATURE_LENGTH}s{ROOT_LENGTH}s')
+V2_VALIDATOR_RECORD = struct.Struct(f'>{PUBLIC_KEY_LENGTH}s{SIGNATURE_LENGTH}s{ROOT_LENGTH}sQ')
+WITHDRAWAL_RECORD = struct.Struct(f'>{PUBLIC_KEY_LENGTH}sQ')
+CONSOLIDATION_RECORD = struct.Struct(f'>{PUBLIC_KEY_LENGTH}s{PUBLIC_KEY_LENGTH}s')
+
+
+def encode_validators(validators: Sequence[Validator]) -> bytes:
+    if isinstance(validators, ValidatorBatch):
+        return _encode_validator_batch(validators)
+
+    size = sum(_get_validator_record(v.validator_type).size for v in validators)
+    buffer = bytearray(size)
+    offset = 0
+    for v in validators:
+        check_length(v.public_key, PUBLIC_KEY_LENGTH)
+        check_length(v.deposit_signature, SIGNATURE_LENGTH)
+        check_length(v.deposit_data_root, ROOT_LENGTH)
+        record = _get_validator_record(v.validator_type)
+        if v.validator_type == ValidatorType.V2:
+            record.pack_into(
+                buffer, offset, v.public_key, v.deposit_signature, v.deposit_data_root, v.amount
+            )
+        else:
+            record.pack_into(buffer, offset, v.public_key, v.deposit_signature, v.deposit_data_root)
+        offset += record.size
+    return bytes(buffer)
+
+
+def encode_withdrawals(public_keys: Sequence[bytes], amounts: Sequence[Gwei]) -> bytes:
+    count = min(len(public_keys), len(amounts))
+    buffer = bytearray(count * WITHDRAWAL_RECORD.size)
+    for i in range(count):
+        check_length(public_keys[i], PUBLIC_KEY_LENGTH)
+        WITHDRAWAL_RECORD.pack_into(buffer, i * WITHDRAWAL_RECORD.size, public_keys[i], amounts[i])
+    return bytes(buffer)
+
+
+def encode_consolidations(
+    source_public_keys: Sequence[bytes], target_public_keys: Sequence[bytes]
+) -> bytes:
+    count = min(len(source_public_keys), len(target_public_keys))
+    buffer = bytearray(count * CONSOLIDATION_RECORD.size)
+    for i in range(count):
+        check_length(source_public_keys[i], PUBLIC_KEY_LENGTH)
+        check_length(target_public_keys[i], PUBLIC_KEY_LENGTH)
+        CONSOLIDATION_RECORD.pack_into(
+            buffer, i * CONSOLIDATION_RECORD.size, source_public_keys[i], target_public_keys[i]
+        )
+    return bytes(buffer)
+
+
+def _encode_validator_batch(batch: ValidatorBatch) -> bytes:
+    """
+    Interleaves the batch buffers into records with strided slice assignments:
+    one copy per byte position of the record instead of one pack per validator.
+    """
+    record = _get_validator_record(batch.validator_type)
+    columns: list[tuple[bytes, int]] = [
+        (batch.public_keys, PUBLIC_KEY_LENGTH),
+        (batch.deposit_signatures, SIGNATURE_LENGTH),
+        (batch.deposit_data_roots, ROOT_LENGTH),
+    ]
+    if batch.validator_type == ValidatorType.V2:
+        columns.append((batch.get_amounts_big_endian(), AMOUNT_LENGTH))
+
+    buffer = bytearray(len(batch) * record.size)
+    offset = 0
+    for column, length in columns:
+        for i in range(length):
+            buffer[offset + i :: record.size] = column[i::length]
+        offset += length
+    return bytes(buffer)
+
+
+def _get_validator_record(validator_type: ValidatorType) -> struct.Struct:
+    if validator_type == ValidatorType.V2:
+        return V2_VALIDATOR_RECORD
+    return V1_VALIDATOR_RECORD
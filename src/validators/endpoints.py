@@ -1,90 +1,177 @@
+import asyncio
+import logging
+from typing import AsyncIterator, Callable
+
+from eth_typing import HexStr
 from fastapi import APIRouter
-from sw_utils import DepositData, get_v2_withdrawal_credentials
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from sw_utils import get_v2_withdrawal_credentials
 from web3 import Web3
 
+from src.common.admission import Admission, admission_controller
 from src.common.contracts import VaultContract, validators_registry_contract
+from src.common.idempotency import idempotency_cache
+from src.common.metrics import batch_size
+from src.common.responses import PydanticJSONResponse
+from src.common.timing import Spans
 from src.validators import schema
-from src.validators.typings import Validator
-from src.validators.validators import generate_validators
+from src.validators.deposit_data import EMPTY_SIGNATURE, get_deposit_data_roots
+from src.validators.encoding import encode_validators
+from src.validators.typings import ValidatorBatch
+from src.validators.validators import generate_validators_async, iter_validators_async
 from src.validators.validators_manager import (
     get_validators_manager_signature_consolidation,
     get_validators_manager_signature_funding,
     get_validators_manager_signature_register,
+    get_validators_manager_signature_register_encoded,
     get_validators_manager_signature_withdrawal,
 )
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
 
-@router.post('/register')
+@router.post(
+    '/register',
+    response_model=schema.ValidatorsRegisterResponse,
+    response_class=PydanticJSONResponse,
+)
 async def register_validators(
     request: schema.ValidatorsRegisterRequest,
-) -> schema.ValidatorsRegisterResponse:
-    validator_items = []
-    validators = generate_validators(
-        vault_address=request.vault,
-        start_index=request.validators_start_index,
-        amounts=request.amounts,
-        validator_type=request.validator_type,
+) -> PydanticJSONResponse:
+    batch_size.labels('register').observe(len(request.amounts))
+    spans = Spans()
+    # fetch registry root while the request waits for admission
+    # and validators are generated in crypto workers
+    registry_root_task = asyncio.create_task(
+        spans.track('registry_root', validators_registry_contract.get_registry_root())
     )
+    try:
+        admission = await spans.track(
+            'admission', admission_controller.admit(request.vault, len(request.amounts))
+        )
+        try:
+            validators = await spans.track(
+                'validators',
+                generate_validators_async(
+                    vault_address=request.vault,
+                    start_index=request.validators_start_index,
+                    amounts=request.amounts,
+                    validator_type=request.validator_type,
+                ),
+            )
+        finally:
+            admission.release()
+    except BaseException:
+        registry_root_task.cancel()
+        raise
+    validators_registry_root = await registry_root_task
+    logger.debug('register %d validators: %s', len(validators), spans)
 
+    # fields are generated by the relayer, they don't need validation
+    validator_items = []
     for validator in validators:
         validator_items.append(
-            schema.ValidatorsRegisterResponseItem(
+            schema.ValidatorsRegisterResponseItem.model_construct(
                 public_key=validator.public_key,
                 deposit_signature=validator.deposit_signature,
                 amount=validator.amount,
-                exit_signature=Web3.to_hex(validator.exit_signature),
+                exit_signature=validator.exit_signature,
             )
         )
 
-    validators_registry_root = await validators_registry_contract.get_registry_root()
-
     validators_manager_signature = get_validators_manager_signature_register(
         Web3.to_checksum_address(request.vault),
         Web3.to_hex(validators_registry_root),
         validators,
     )
 
-    return schema.ValidatorsRegisterResponse(
-        validators=validator_items,
-        validators_manager_signature=validators_manager_signature,
+    return PydanticJSONResponse(
+        schema.ValidatorsRegisterResponse.model_construct(
+            validators=validator_items,
+            validators_manager_signature=validators_manager_signature,
+        )
     )
 
 
-@router.post('/fund')
-async def fund_validators(
-    request: schema.ValidatorsFundRequest,
-) -> schema.ValidatorsSignatureResponse:
-    validators = []
+@router.post('/register/stream')
+async def register_validators_stream(
+    request: schema.ValidatorsRegisterRequest,
+) -> StreamingResponse:
+    """
+    Streams `ValidatorsRegisterStreamItem` records as NDJSON while validators are generated.
+    The last record is `ValidatorsRegisterStreamResult` with the signature for the whole batch.
+    Validators without the signature can't be registered, so an interrupted stream
+    must be retried with the original `validators_start_index` and amounts.
+    """
+    batch_size.labels('register_stream').observe(len(request.amounts))
+    # rejected requests get an error status before the stream is started
+    admission = await admission_controller.admit(request.vault, len(request.amounts))
+    return StreamingResponse(
+        _stream_register_validators(request, admission),
+        media_type='application/x-ndjson',
+        # releases the admission when the stream is closed before it was started
+        background=BackgroundTask(admission.release),
+    )
 
-    # use empty signature for funding
-    empty_signature = bytes(96)
-    for public_key, amount in zip(request.public_keys, request.amounts):
-        deposit_data = DepositData(
-            pubkey=Web3.to_bytes(hexstr=public_key),
-            withdrawal_credentials=get_v2_withdrawal_credentials(request.vault),
-            amount=amount,
-            signature=empty_signature,
-        )
-        validator = Validator(
-            public_key=public_key,
-            amount=amount,
-            deposit_signature=Web3.to_hex(empty_signature),
-            deposit_data_root=Web3.to_hex(deposit_data.hash_tree_root),
-        )
-        validators.append(validator)
 
-    vault_contract = VaultContract(request.vault)
-    validators_manager_nonce = await vault_contract.validators_manager_nonce()
-    validators_manager_signature = get_validators_manager_signature_funding(
+async def _stream_register_validators(
+    request: schema.ValidatorsRegisterRequest, admission: Admission
+) -> AsyncIterator[str]:
+    registry_root_task = asyncio.create_task(validators_registry_contract.get_registry_root())
+    encoded_validators = bytearray()
+    validator_index = request.validators_start_index
+    try:
+        async for validators in iter_validators_async(
+            vault_address=request.vault,
+            start_index=request.validators_start_index,
+            amounts=request.amounts,
+            validator_type=request.validator_type,
+        ):
+            encoded_validators += encode_validators(validators)
+            for validator in validators:
+                item = schema.ValidatorsRegisterStreamItem.model_construct(
+                    validator_index=validator_index,
+                    public_key=validator.public_key,
+                    deposit_signature=validator.deposit_signature,
+                    amount=validator.amount,
+                    exit_signature=validator.exit_signature,
+                )
+                validator_index += 1
+                yield item.model_dump_json() + '\n'
+
+        validators_registry_root = await registry_root_task
+    finally:
+        registry_root_task.cancel()
+        admission.release()
+
+    validators_manager_signature = get_validators_manager_signature_register_encoded(
         Web3.to_checksum_address(request.vault),
-        validators_manager_nonce,
-        validators,
+        Web3.to_hex(validators_registry_root),
+        bytes(encoded_validators),
     )
-
-    return schema.ValidatorsSignatureResponse(
+    result = schema.ValidatorsRegisterStreamResult(
         validators_manager_signature=validators_manager_signature,
+        next_validators_start_index=validator_index,
+    )
+    yield result.model_dump_json() + '\n'
+
+
+@router.post('/fund')
+async def fund_validators(
+    request: schema.ValidatorsFundRequest,
+) -> schema.ValidatorsSignatureResponse:
+    batch_size.labels('fund').observe(len(request.public_keys))
+    return await _get_signature_response(
+        'fund',
+        request,
+        lambda nonce: get_validators_manager_signature_funding(
+            Web3.to_checksum_address(request.vault),
+            nonce,
+            _get_funding_validators(request),
+        ),
     )
 
 
@@ -92,17 +179,16 @@ async def fund_validators(
 async def withdraw_validators(
     request: schema.ValidatorsWithdrawalRequest,
 ) -> schema.ValidatorsSignatureResponse:
-    vault_contract = VaultContract(request.vault)
-    validators_manager_nonce = await vault_contract.validators_manager_nonce()
-    validators_manager_signature = get_validators_manager_signature_withdrawal(
-        Web3.to_checksum_address(request.vault),
-        validators_manager_nonce,
-        request.public_keys,
-        request.amounts,
-    )
-
-    return schema.ValidatorsSignatureResponse(
-        validators_manager_signature=validators_manager_signature,
+    batch_size.labels('withdraw').observe(len(request.public_keys))
+    return await _get_signature_response(
+        'withdraw',
+        request,
+        lambda nonce: get_validators_manager_signature_withdrawal(
+            Web3.to_checksum_address(request.vault),
+            nonce,
+            request.public_keys,
+            request.amounts,
+        ),
     )
 
 
@@ -110,15 +196,61 @@ async def withdraw_validators(
 async def consolidate_validators(
     request: schema.ValidatorsConsolidationRequest,
 ) -> schema.ValidatorsSignatureResponse:
+    batch_size.labels('consolidate').observe(len(request.source_public_keys))
+    return await _get_signature_response(
+        'consolidate',
+        request,
+        lambda nonce: get_validators_manager_signature_consolidation(
+            Web3.to_checksum_address(request.vault),
+            nonce,
+            request.source_public_keys,
+            request.target_public_keys,
+        ),
+    )
+
+
+async def _get_signature_response(
+    endpoint: str,
+    request: schema.ValidatorsFundRequest
+    | schema.ValidatorsWithdrawalRequest
+    | schema.ValidatorsConsolidationRequest,
+    sign: Callable[[int], HexStr],
+) -> schema.ValidatorsSignatureResponse:
+    """
+    Signs the request payload for the current validators manager nonce of the vault.
+    Retried requests get the same response until the nonce is changed.
+    """
     vault_contract = VaultContract(request.vault)
     validators_manager_nonce = await vault_contract.validators_manager_nonce()
-    validators_manager_signature = get_validators_manager_signature_consolidation(
-        Web3.to_checksum_address(request.vault),
-        validators_manager_nonce,
-        request.source_public_keys,
-        request.target_public_keys,
+
+    key = idempotency_cache.get_key(endpoint, request, validators_manager_nonce)
+    cached_response = await idempotency_cache.get(endpoint, key)
+    if cached_response is not None:
+        return schema.ValidatorsSignatureResponse.model_validate_json(cached_response)
+
+    response = schema.ValidatorsSignatureResponse(
+        validators_manager_signature=sign(validators_manager_nonce),
     )
+    await idempotency_cache.put(key, response.model_dump_json())
+    return response
 
-    return schema.ValidatorsSignatureResponse(
-        validators_manager_signature=validators_manager_signature,
+
+def _get_funding_validators(request: schema.ValidatorsFundRequest) -> ValidatorBatch:
+    # use empty signature for funding
+    deposit_data_roots = get_deposit_data_roots(
+        public_keys=request.public_keys,
+        withdrawal_credentials=get_v2_withdrawal_credentials(request.vault),
+        amounts=request.amounts,
+        signature=EMPTY_SIGNATURE,
     )
+    validators = ValidatorBatch()
+    for public_key, amount, deposit_data_root in zip(
+        request.public_keys, request.amounts, deposit_data_roots
+    ):
+        validators.append(
+            public_key=public_key,
+            deposit_signature=EMPTY_SIGNATURE,
+            deposit_data_root=deposit_data_root,
+            amount=amount,
+        )
+    return validators
@@ -0,0 +1,170 @@
+import asyncio
+import logging
+from collections import deque
+from dataclasses import dataclass
+
+from eth_typing import ChecksumAddress
+from web3 import Web3
+
+from src.common.executor import crypto_executor
+from src.common.metrics import (
+    key_pool_generated,
+    key_pool_hits,
+    key_pool_keys,
+    key_pool_misses,
+)
+from src.config import settings
+from src.validators.credentials import Credential, CredentialManager
+from src.validators.key_seed import get_seed_tree, key_index_allocator
+from src.validators.typings import ValidatorType
+
+logger = logging.getLogger(__name__)
+
+PoolKey = tuple[ChecksumAddress, ValidatorType]
+
+
+@dataclass
+class KeyPoolStats:
+    hits: int = 0
+    misses: int = 0
+    generated: int = 0
+
+
+class KeyPool:
+    """
+    Keeps pre-generated credentials per (vault, validator type) for `settings.key_pool_vaults`.
+    Pools are not created for other vaults, so requests with arbitrary vaults
+    can't trigger key generation in advance.
+    When a pool drops below the low watermark it is refilled up to the high watermark
+    in crypto workers, so requests only have to compute deposit and exit signatures.
+    """
+
+    def __init__(self) -> None:
+        self.stats = KeyPoolStats()
+        self._pools: dict[PoolKey, deque[Credential]] = {}
+        self._refill_event: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return settings.key_pool_enabled
+
+    def start(self) -> None:
+        if not self.enabled:
+            return
+        self._refill_event = asyncio.Event()
+        for vault in settings.key_pool_vaults:
+            for validator_type in ValidatorType:
+                self._pools[(Web3.to_checksum_address(vault), validator_type)] = deque()
+        self._refill_event.set()
+        self._task = asyncio.create_task(self._refill_loop())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def take(
+        self, vault: ChecksumAddress, validator_type: ValidatorType, count: int
+    ) -> list[Credential]:
+        """Returns up to `count` credentials. The caller generates the missing ones."""
+        if not self.enabled:
+            return []
+
+        pool = self._pools.get((Web3.to_checksum_address(vault), validator_type))
+        if pool is None:
+            return []
+        credentials = [pool.popleft() for _ in range(min(count, len(pool)))]
+        self.stats.hits += len(credentials)
+        self.stats.misses += count - len(credentials)
+        key_pool_hits.inc(len(credentials))
+        key_pool_misses.inc(count - len(credentials))
+
+        self._set_keys_metric()
+        if len(pool) < settings.key_pool_low_watermark and self._refill_event is not None:
+            self._refill_event.set()
+        return credentials
+
+    async def _refill_loop(self) -> None:
+        refill_event = self._refill_event
+        if refill_event is None:
+            return
+
+        while True:
+            try:
+                await asyncio.wait_for(
+                    refill_event.wait(), timeout=settings.key_pool_metrics_interval or None
+                )
+            except asyncio.TimeoutError:
+                self._log_stats()
+                continue
+
+            refill_event.clear()
+            for key in list(self._pools):
+                try:
+                    await self._refill(key)
+                except Exception as e:
+                    logger.exception('Failed to refill key pool for vault %s: %s', key[0], e)
+
+    async def _refill(self, key: PoolKey) -> None:
+        vault, validator_type = key
+        pool = self._pools.get(key)
+        if pool is None or len(pool) >= settings.key_pool_low_watermark:
+            return
+
+        while len(pool) < settings.key_pool_high_watermark:
+            count = min(settings.crypto_chunk_size, settings.key_pool_high_watermark - len(pool))
+            key_start_index = None
+            if key_index_allocator.enabled:
+                key_start_index = await key_index_allocator.allocate(count=count, vault=vault)
+            credentials = await crypto_executor.run(
+                generate_pool_credentials,
+                count=count,
+                vault_address=vault,
+                validator_type=validator_type,
+                key_start_index=key_start_index,
+            )
+            pool.extend(credentials)
+            self._set_keys_metric()
+            self.stats.generated += len(credentials)
+            key_pool_generated.inc(len(credentials))
+
+    def _set_keys_metric(self) -> None:
+        key_pool_keys.set(sum(len(pool) for pool in self._pools.values()))
+
+    def _log_stats(self) -> None:
+        logger.info(
+            'key pool: vaults %d, keys %d, hits %d, misses %d, generated %d',
+            len(self._pools),
+            sum(len(pool) for pool in self._pools.values()),
+            self.stats.hits,
+            self.stats.misses,
+            self.stats.generated,
+        )
+
+
+def generate_pool_credentials(
+    count: int,
+    vault_address: ChecksumAddress,
+    validator_type: ValidatorType,
+    key_start_index: int | None = None,
+) -> list[Credential]:
+    """Runs in crypto workers. Public keys and withdrawal credentials are computed in advance."""
+    credentials = CredentialManager.generate_credentials(
+        count=count,
+        start_index=0 if key_start_index is None else key_start_index,
+        vault_address=vault_address,
+        validator_type=validator_type,
+        tree=None if key_start_index is None else get_seed_tree(),
+    )
+    for credential in credentials:
+        _ = credential.public_key, credential.withdrawal_credentials
+    return credentials
+
+
+key_pool = KeyPool()
@@ -0,0 +1,117 @@
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+from functools import cache
+
+from eth_typing import BLSPrivateKey, ChecksumAddress
+
+from src.config import settings
+from src.validators.credentials import DerivationTree
+
+logger = logging.getLogger(__name__)
+
+
+class KeyIndexAllocator:
+    """
+    Hands out ranges of key indexes for derivation from the mnemonic.
+    Every range is persisted before the keys are derived, so an index is never used twice
+    and all keys can be recovered by deriving the indexes below the high-water mark.
+    The database may be shared by several server workers.
+    """
+
+    def __init__(self, path: str | None = None) -> None:
+        self.path = settings.key_index_db_path if path is None else path
+        self._db: sqlite3.Connection | None = None
+        # one transaction at a time on the shared connection
+        self._db_lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(settings.key_mnemonic_file)
+
+    def start(self) -> None:
+        if not self.enabled:
+            return
+        if not os.path.isfile(settings.key_mnemonic_file):
+            raise ValueError(f"Can't open mnemonic file. Path: {settings.key_mnemonic_file}")
+        # keys below the high-water mark are recovered by deriving them from the mnemonic
+        logger.info('key index high-water mark: %d', self.high_water_mark)
+
+    async def allocate(
+        self, count: int, vault: ChecksumAddress, validators_start_index: int | None = None
+    ) -> int:
+        """
+        Returns the first index of `count` unused key indexes.
+        The transaction waits for other server workers, so it runs in a thread.
+        """
+        return await asyncio.to_thread(self._allocate, count, vault, validators_start_index)
+
+    @property
+    def high_water_mark(self) -> int:
+        with self._db_lock:
+            return self._get_high_water_mark(self._get_db())
+
+    def close(self) -> None:
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _allocate(
+        self, count: int, vault: ChecksumAddress, validators_start_index: int | None
+    ) -> int:
+        with self._db_lock:
+            db = self._get_db()
+            db.execute('BEGIN IMMEDIATE')
+            try:
+                start_index = self._get_high_water_mark(db)
+                db.execute(
+                    'INSERT INTO key_allocations '
+                    '(start_index, count, vault, validators_start_index, created_at) '
+                    'VALUES (?, ?, ?, ?, ?)',
+                    (start_index, count, vault, validators_start_index, time.time()),
+                )
+            except BaseException:
+                db.execute('ROLLBACK')
+                raise
+            db.execute('COMMIT')
+        return start_index
+
+    def _get_db(self) -> sqlite3.Connection:
+        if self._db is None:
+            # transactions are managed explicitly and run in threads of the default executor
+            self._db = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS key_allocations ('
+                'start_index INTEGER NOT NULL, count INTEGER NOT NULL, vault TEXT NOT NULL, '
+                'validators_start_index INTEGER, created_at REAL NOT NULL)'
+            )
+        return self._db
+
+    @staticmethod
+    def _get_high_water_mark(db: sqlite3.Connection) -> int:
+        # ranges are allocated in increasing order
+        row = db.execute(
+            'SELECT start_index + count FROM key_allocations ORDER BY rowid DESC LIMIT 1'
+        ).fetchone()
+        return row[0] if row else 0
+
+
+@cache
+def get_seed_tree() -> DerivationTree:
+    """Runs in crypto workers. The mnemonic is read and the seed is computed once per process."""
+    # pylint: disable=import-outside-toplevel
+    from staking_deposit.key_handling.key_derivation.mnemonic import get_seed
+    from staking_deposit.key_handling.key_derivation.tree import derive_master_SK
+
+    with open(settings.key_mnemonic_file, 'r', encoding='utf-8') as f:
+        mnemonic = f.read().strip()
+    seed = get_seed(mnemonic=mnemonic, password='')
+    return DerivationTree(BLSPrivateKey(derive_master_SK(seed)))
+
+
+key_index_allocator = KeyIndexAllocator()
@@ -0,0 +1,192 @@
+import asyncio
+import logging
+import multiprocessing
+import secrets
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from src.common.metrics import keystore_queue_size, stored_keystores
+from src.config import settings
+from src.config.settings import KEYSTORE_KDF_PBKDF2
+from src.validators.credentials import Credential
+
+logger = logging.getLogger(__name__)
+
+# public key, vault, network, derivation path, EIP-2335 keystore json, created at
+KeystoreRow = tuple[bytes, str, str, str, str, float]
+
+
+class KeystoreStore:
+    """
+    Saves generated credentials as EIP-2335 keystores in SQLite, indexed by public key.
+    Credentials are queued on the request path and encrypted in the background
+    by `settings.keystore_workers` processes, separate from the crypto workers.
+    The queue holds up to `settings.keystore_queue_size` keys, requests wait when it is full,
+    so generation slows down to the encryption rate instead of piling up unsaved keys.
+    """
+
+    def __init__(self, path: str | None = None) -> None:
+        self.path = settings.keystore_store_path if path is None else path
+        self._db: sqlite3.Connection | None = None
+        self._queue: asyncio.Queue[Credential] | None = None
+        self._executor: ProcessPoolExecutor | None = None
+        self._password = ''
+        self._pending = 0
+        self._task: asyncio.Task | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path)
+
+    def start(self) -> None:
+        if not self.enabled:
+            return
+        with open(settings.keystore_password_file, 'r', encoding='utf-8') as f:
+            self._password = f.read().strip()
+
+        self._queue = asyncio.Queue(maxsize=settings.keystore_queue_size)
+        self._executor = ProcessPoolExecutor(
+            max_workers=settings.keystore_workers,
+            mp_context=multiprocessing.get_context('spawn'),
+        )
+        self._task = asyncio.create_task(self._write_loop())
+
+    async def stop(self) -> None:
+        """Waits up to `settings.keystore_stop_timeout` seconds until queued keys are saved."""
+        if self._task is None or self._queue is None:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=settings.keystore_stop_timeout)
+        except asyncio.TimeoutError:
+            logger.error('%d generated keys are not saved to the keystore store', self._pending)
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self.close()
+
+    async def save(self, credentials: list[Credential]) -> None:
+        """Queues the credentials, waits while the queue is full."""
+        if self._queue is None:
+            return
+        for credential in credentials:
+            await self._queue.put(credential)
+            self._pending += 1
+            keystore_queue_size.set(self._pending)
+
+    def get_keystore(self, public_key: bytes) -> str | None:
+        row = (
+            self.get_db()
+            .execute('SELECT keystore FROM keystores WHERE public_key = ?', (public_key,))
+            .fetchone()
+        )
+        return row[0] if row else None
+
+    def insert(self, rows: list[KeystoreRow]) -> None:
+        with self.get_db() as db:
+            db.executemany(
+                'INSERT OR IGNORE INTO keystores '
+                '(public_key, vault, network, path, keystore, created_at) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                rows,
+            )
+
+    def get_db(self) -> sqlite3.Connection:
+        if self._db is None:
+            # rows are inserted from a thread, one at a time
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS keystores ('
+                'public_key BLOB PRIMARY KEY, vault TEXT NOT NULL, network TEXT NOT NULL, '
+                'path TEXT NOT NULL, keystore TEXT NOT NULL, created_at REAL NOT NULL'
+                ') WITHOUT ROWID'
+            )
+        return self._db
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    async def _write_loop(self) -> None:
+        queue = self._queue
+        if queue is None:
+            return
+
+        # keys encrypted at once, the rest waits in the queue and counts towards its size
+        max_credentials = settings.keystore_workers * settings.keystore_batch_size
+        while True:
+            credentials = [await queue.get()]
+            while not queue.empty() and len(credentials) < max_credentials:
+                credentials.append(queue.get_nowait())
+            try:
+                await self._save(credentials)
+            except Exception as e:
+                logger.exception('Failed to save %d keystores: %s', len(credentials), e)
+            finally:
+                self._pending -= len(credentials)
+                keystore_queue_size.set(self._pending)
+                for _ in credentials:
+                    queue.task_done()
+
+    async def _save(self, credentials: list[Credential]) -> None:
+        loop = asyncio.get_running_loop()
+        batch_size = settings.keystore_batch_size
+        jobs = [
+            loop.run_in_executor(
+                self._executor,
+                partial(
+                    encrypt_keystores,
+                    credentials=credentials[offset : offset + batch_size],
+                    password=self._password,
+                    kdf=settings.keystore_kdf,
+                ),
+            )
+            for offset in range(0, len(credentials), batch_size)
+        ]
+        keystores = [keystore for chunk in await asyncio.gather(*jobs) for keystore in chunk]
+
+        created_at = time.time()
+        rows = [
+            (c.public_key, c.vault, c.network, c.path or '', keystore, created_at)
+            for c, keystore in zip(credentials, keystores)
+        ]
+        await asyncio.to_thread(self.insert, rows)
+        stored_keystores.inc(len(rows))
+
+
+def encrypt_keystores(credentials: list[Credential], password: str, kdf: str) -> list[str]:
+    """Runs in keystore workers, the keystore module is not imported by the server."""
+    # pylint: disable=import-outside-toplevel
+    from staking_deposit.key_handling.keystore import (
+        Keystore,
+        Pbkdf2Keystore,
+        ScryptKeystore,
+    )
+
+    keystore_class: type[Keystore] = (
+        Pbkdf2Keystore if kdf == KEYSTORE_KDF_PBKDF2 else ScryptKeystore
+    )
+    keystores = []
+    for credential in credentials:
+        keystore = keystore_class.encrypt(
+            secret=credential.private_key.to_bytes(32, 'big'),
+            password=password,
+            path=credential.path or '',
+            kdf_salt=secrets.token_bytes(32),
+            aes_iv=secrets.token_bytes(16),
+        )
+        keystore.pubkey = credential.public_key.hex()
+        keystores.append(keystore.as_json())
+    return keystores
+
+
+keystore_store = KeystoreStore()
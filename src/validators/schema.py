@@ -1,22 +1,74 @@
-from eth_typing import ChecksumAddress, HexStr
-from pydantic import BaseModel
+from typing import Annotated, Any, Sequence
+
+from eth_typing import BLSPubkey, BLSSignature, ChecksumAddress, HexStr
+from pydantic import BaseModel, Field, PlainSerializer, PlainValidator, model_validator
 from web3.types import Gwei
 
-from src.validators.typings import ValidatorType
+from src.config import settings
+from src.validators.typings import PUBLIC_KEY_LENGTH, SIGNATURE_LENGTH, ValidatorType
+
+
+def _decode_hex(value: Any, length: int) -> bytes:
+    if isinstance(value, bytes) and len(value) == length:
+        return value
+    if not isinstance(value, str):
+        raise ValueError('Value must be a hex string')
+
+    if value[:2] in ('0x', '0X'):
+        value = value[2:]
+    if len(value) != 2 * length:
+        raise ValueError(f'Value must be {length} bytes long')
+    # bytes.fromhex skips whitespace, so the result length is checked as well
+    result = bytes.fromhex(value)
+    if len(result) != length:
+        raise ValueError('Value must be a hex string')
+    return result
+
+
+def _validate_public_key(value: Any) -> BLSPubkey:
+    return BLSPubkey(_decode_hex(value, PUBLIC_KEY_LENGTH))
+
+
+def _validate_signature(value: Any) -> BLSSignature:
+    return BLSSignature(_decode_hex(value, SIGNATURE_LENGTH))
+
+
+def _encode_hex(value: bytes) -> HexStr:
+    return HexStr('0x' + value.hex())
+
+
+# hex strings in JSON, bytes decoded once on validation in the app
+PublicKey = Annotated[
+    BLSPubkey,
+    PlainValidator(_validate_public_key, json_schema_input_type=HexStr),
+    PlainSerializer(_encode_hex, return_type=HexStr),
+]
+Signature = Annotated[
+    BLSSignature,
+    PlainValidator(_validate_signature, json_schema_input_type=HexStr),
+    PlainSerializer(_encode_hex, return_type=HexStr),
+]
+# amounts are encoded as uint64 in validators manager payloads
+Amount = Annotated[Gwei, Field(ge=0, lt=2**64)]
+
+# longer batches are rejected with 422
+RegisterAmounts = Annotated[list[Amount], Field(max_length=settings.register_max_batch_size)]
+SigningPublicKeys = Annotated[list[PublicKey], Field(max_length=settings.signing_max_batch_size)]
+SigningAmounts = Annotated[list[Amount], Field(max_length=settings.signing_max_batch_size)]
 
 
 class ValidatorsRegisterRequest(BaseModel):
     vault: ChecksumAddress
     validators_start_index: int
-    amounts: list[Gwei]
+    amounts: RegisterAmounts
     validator_type: ValidatorType
 
 
 class ValidatorsRegisterResponseItem(BaseModel):
-    public_key: HexStr
-    deposit_signature: HexStr
-    amount: Gwei
-    exit_signature: HexStr
+    public_key: PublicKey
+    deposit_signature: Signature
+    amount: Amount
+    exit_signature: Signature
 
 
 class ValidatorsRegisterResponse(BaseModel):
@@ -24,23 +76,57 @@ class ValidatorsRegisterResponse(BaseModel):
     validators_manager_signature: HexStr
 
 
+class ValidatorsRegisterStreamItem(ValidatorsRegisterResponseItem):
+    validator_index: int
+
+
+class ValidatorsRegisterStreamResult(BaseModel):
+    validators_manager_signature: HexStr
+    # `validators_start_index` of the next request once this batch is registered
+    next_validators_start_index: int
+
+
 class ValidatorsFundRequest(BaseModel):
     vault: ChecksumAddress
-    public_keys: list[HexStr]
-    amounts: list[Gwei]
+    public_keys: SigningPublicKeys
+    amounts: SigningAmounts
+
+    @model_validator(mode='after')
+    def check_lengths(self) -> 'ValidatorsFundRequest':
+        _check_same_length(public_keys=self.public_keys, amounts=self.amounts)
+        return self
 
 
 class ValidatorsWithdrawalRequest(BaseModel):
     vault: ChecksumAddress
-    public_keys: list[HexStr]
-    amounts: list[Gwei]
+    public_keys: SigningPublicKeys
+    amounts: SigningAmounts
+
+    @model_validator(mode='after')
+    def check_lengths(self) -> 'ValidatorsWithdrawalRequest':
+        _check_same_length(public_keys=self.public_keys, amounts=self.amounts)
+        return self
 
 
 class ValidatorsConsolidationRequest(BaseModel):
     vault: ChecksumAddress
-    source_public_keys: list[HexStr]
-    target_public_keys: list[HexStr]
+    source_public_keys: SigningPublicKeys
+    target_public_keys: SigningPublicKeys
+
+    @model_validator(mode='after')
+    def check_lengths(self) -> 'ValidatorsConsolidationRequest':
+        _check_same_length(
+            source_public_keys=self.source_public_keys,
+            target_public_keys=self.target_public_keys,
+        )
+        return self
 
 
 class ValidatorsSignatureResponse(BaseModel):
     validators_manager_signature: HexStr
+
+
+def _check_same_length(**fields: Sequence) -> None:
+    # encoders would silently drop the items without a pair
+    if len({len(value) for value in fields.values()}) > 1:
+        raise ValueError(f'{" and ".join(fields)} must have the same length')
@@ -0,0 +1,108 @@
+from dataclasses import dataclass
+from functools import cache
+from hashlib import sha256
+
+from eth_typing import BLSPrivateKey, BLSSignature
+from sw_utils.typings import Bytes32
+
+from src.config.networks import NETWORKS
+from src.validators.bls_backends import get_bls_backend
+from src.validators.deposit_data import (
+    ZERO_CHUNK,
+    get_public_key_root,
+    get_signature_root,
+    get_uint64_leaf,
+)
+
+DOMAIN_DEPOSIT = bytes.fromhex('03000000')
+DOMAIN_VOLUNTARY_EXIT = bytes.fromhex('04000000')
+
+
+@dataclass(frozen=True)
+class SigningContext:
+    """Signing domains of the network, computed once per process."""
+
+    deposit_domain: bytes
+    exit_domain: bytes
+    exit_epoch: int
+
+
+@dataclass
+class DepositDatum:
+    deposit_message_root: Bytes32
+    signing_root: Bytes32
+    signature: BLSSignature
+    deposit_data_root: Bytes32
+
+
+@cache
+def get_signing_context(network: str) -> SigningContext:
+    network_config = NETWORKS[network]
+    # deposits are valid on all forks, the domain doesn't depend on genesis validators root
+    deposit_domain = compute_domain(DOMAIN_DEPOSIT, network_config.GENESIS_FORK_VERSION, ZERO_CHUNK)
+    exit_domain = compute_domain(
+        DOMAIN_VOLUNTARY_EXIT,
+        network_config.SHAPELLA_FORK.version,
+        network_config.GENESIS_VALIDATORS_ROOT,
+    )
+    return SigningContext(
+        deposit_domain=deposit_domain,
+        exit_domain=exit_domain,
+        exit_epoch=network_config.SHAPELLA_FORK.epoch,
+    )
+
+
+def build_deposit_datum(
+    context: SigningContext,
+    private_key: BLSPrivateKey,
+    public_key: bytes,
+    withdrawal_credentials: bytes,
+    amount: int,
+) -> DepositDatum:
+    """
+    Signs the deposit and computes its roots in one pass.
+    DepositMessage and DepositData share the left subtree: pubkey root and withdrawal credentials.
+    """
+    left = sha256(get_public_key_root(public_key) + withdrawal_credentials).digest()
+    amount_leaf = get_uint64_leaf(amount)
+
+    deposit_message_root = sha256(left + sha256(amount_leaf + ZERO_CHUNK).digest()).digest()
+    signing_root = compute_signing_root(deposit_message_root, context.deposit_domain)
+    signature = get_bls_backend().sign(private_key, signing_root)
+
+    right = sha256(amount_leaf + get_signature_root(signature)).digest()
+    return DepositDatum(
+        deposit_message_root=Bytes32(deposit_message_root),
+        signing_root=signing_root,
+        signature=signature,
+        deposit_data_root=Bytes32(sha256(left + right).digest()),
+    )
+
+
+def get_deposit_signing_root(
+    context: SigningContext, public_key: bytes, withdrawal_credentials: bytes, amount: int
+) -> Bytes32:
+    left = sha256(get_public_key_root(public_key) + withdrawal_credentials).digest()
+    right = sha256(get_uint64_leaf(amount) + ZERO_CHUNK).digest()
+    return compute_signing_root(sha256(left + right).digest(), context.deposit_domain)
+
+
+def get_exit_signing_root(context: SigningContext, validator_index: int) -> Bytes32:
+    # VoluntaryExit leaves: epoch, validator index
+    exit_root = sha256(get_uint64_leaf(context.exit_epoch) + get_uint64_leaf(validator_index))
+    return compute_signing_root(exit_root.digest(), context.exit_domain)
+
+
+def compute_signing_root(object_root: bytes, domain: bytes) -> Bytes32:
+    # SigningData leaves: object root, domain
+    return Bytes32(sha256(object_root + domain).digest())
+
+
+def compute_domain(
+    domain_type: bytes, fork_version: bytes, genesis_validators_root: bytes
+) -> bytes:
+    # ForkData leaves: fork version padded to a chunk, genesis validators root
+    fork_data_root = sha256(
+        bytes(fork_version) + ZERO_CHUNK[len(fork_version) :] + bytes(genesis_validators_root)
+    ).digest()
+    return domain_type + fork_data_root[:28]
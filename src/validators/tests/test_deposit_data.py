@@ -0,0 +1,89 @@
+import pytest
+from eth_typing import BLSPrivateKey
+from sw_utils import get_v2_withdrawal_credentials
+from sw_utils.signing import (
+    DepositData,
+    DepositMessage,
+    compute_deposit_domain,
+    compute_signing_root,
+)
+from web3 import Web3
+
+from src.config.networks import NETWORKS
+from src.validators.bls_backends import get_bls_backend
+from src.validators.deposit_data import get_deposit_data_roots
+from src.validators.signing import build_deposit_datum, get_signing_context
+
+PRIVATE_KEYS = [BLSPrivateKey(1), BLSPrivateKey(2**200 + 7)]
+VAULT = Web3.to_checksum_address('0x' + '22' * 20)
+WITHDRAWAL_CREDENTIALS = get_v2_withdrawal_credentials(VAULT)
+AMOUNTS = [32 * 10**9, 1, 2**64 - 1]
+
+
+@pytest.mark.parametrize('network', list(NETWORKS))
+@pytest.mark.parametrize('private_key', PRIVATE_KEYS)
+def test_build_deposit_datum(network: str, private_key: BLSPrivateKey) -> None:
+    context = get_signing_context(network)
+    domain = compute_deposit_domain(NETWORKS[network].GENESIS_FORK_VERSION)
+    public_key = get_bls_backend().sk_to_pk(private_key)
+
+    for amount in AMOUNTS:
+        deposit_message = DepositMessage(
+            pubkey=public_key, withdrawal_credentials=WITHDRAWAL_CREDENTIALS, amount=amount
+        )
+        datum = build_deposit_datum(
+            context=context,
+            private_key=private_key,
+            public_key=public_key,
+            withdrawal_credentials=WITHDRAWAL_CREDENTIALS,
+            amount=amount,
+        )
+        deposit_data = DepositData(
+            pubkey=public_key,
+            withdrawal_credentials=WITHDRAWAL_CREDENTIALS,
+            amount=amount,
+            signature=datum.signature,
+        )
+
+        assert datum.deposit_message_root == deposit_message.hash_tree_root
+        assert datum.signing_root == compute_signing_root(deposit_message, domain)
+        assert datum.deposit_data_root == deposit_data.hash_tree_root
+        assert get_bls_backend().verify(public_key, datum.signing_root, datum.signature)
+
+
+def test_get_deposit_data_roots() -> None:
+    public_keys = [_fill(i, 48) for i in range(4)]
+    amounts = [AMOUNTS[i % len(AMOUNTS)] for i in range(4)]
+    signature = _fill(100, 96)
+
+    roots = get_deposit_data_roots(public_keys, WITHDRAWAL_CREDENTIALS, amounts, signature)
+    empty_signature_roots = get_deposit_data_roots(public_keys, WITHDRAWAL_CREDENTIALS, amounts)
+
+    for public_key, amount, root, empty_signature_root in zip(
+        public_keys, amounts, roots, empty_signature_roots
+    ):
+        deposit_data = DepositData(
+            pubkey=public_key,
+            withdrawal_credentials=WITHDRAWAL_CREDENTIALS,
+            amount=amount,
+            signature=signature,
+        )
+        empty_signature_deposit_data = DepositData(
+            pubkey=public_key,
+            withdrawal_credentials=WITHDRAWAL_CREDENTIALS,
+            amount=amount,
+            signature=bytes(96),
+        )
+        assert root == deposit_data.hash_tree_root
+        assert empty_signature_root == empty_signature_deposit_data.hash_tree_root
+
+
+def test_get_deposit_data_roots_invalid_length() -> None:
+    with pytest.raises(ValueError):
+        get_deposit_data_roots([_fill(0, 47)], WITHDRAWAL_CREDENTIALS, [1])
+    with pytest.raises(ValueError):
+        get_deposit_data_roots([_fill(0, 48)], WITHDRAWAL_CREDENTIALS[:31], [1])
+
+
+def _fill(seed: int, length: int) -> bytes:
+    return bytes((seed + i) % 256 for i in range(length))
@@ -0,0 +1,117 @@
+import pytest
+from eth_account import Account
+from web3 import Web3
+
+from src.config import settings
+from src.validators.eip712 import get_vault_validators_hash, sign_vault_validators
+
+ACCOUNT = Account.from_key('0x' + '11' * 32)
+VAULT = Web3.to_checksum_address('0x' + '22' * 20)
+
+# message hashes and signatures of `encode_typed_data` signing in the baseline validators manager
+VECTORS = [
+    (
+        'register_v2',
+        560048,
+        '108c9a268edc7b4b997d4d52c944d0d48e82638eae00d225bba97192e92e54bd',
+        '75e311f53d83fe80843cbfc0a023b8ac9ed4bcc80b72514e73bf1e70365300d7'
+        '2702d71ae96703f01fba58a06e95adb9691d93bc57f2a5a064f18d546bb4cc821b',
+    ),
+    (
+        'register_v1',
+        1,
+        '862aae362769ed532098de90b777d2b418263633cc632bb3d591e0e56157c490',
+        '32dbe428a7450ef76d04d45e5661f8d5b66aaafd340ebe5690f2670568dd2c02'
+        '08b00fb0b130a00611ee62db020d876bae5127dfcd566d4b6491b7a5a6c687be1c',
+    ),
+    (
+        'fund',
+        100,
+        'bd26d8989662e458a37e0f1de4b0cdb7812593cf65f10e71530d96c4b66a24da',
+        '4cac46c90f8e60dff066661d5146af35639ba8484bda134c44da4a67c99177ab'
+        '36c3ee6210875e36335f8aad024355df730be2dc9eaf9acf67a4fb67ccadd11a1c',
+    ),
+    (
+        'withdraw',
+        560048,
+        '7c63ca299abe2906903ec52b009e012e5dfd1fd4cde61469c0a172e532f7e7fe',
+        'aee6a7cc2e05469da45d6616fa0762e36f3cd860bf88a9f4e4f4b2c16146f9f5'
+        '07124ec3a801d0bfdf83c2513afef520dc1ce74e92a63916f9304534f7a0159a1b',
+    ),
+    (
+        'consolidate',
+        1,
+        'a8f156a9ecb7cbc1bd96e272d0f50a033aa48659a0658823e35a628d5cbd1e79',
+        '76eece98c96d73beb7c68a423ffdfbf7188eecaafcf0d71aeb67cb3c1357530d'
+        '5c32ec0ee6e53b25a65a2d65f76abf9ad05f1c88937b8efae82485724e38051c1c',
+    ),
+    (
+        'empty',
+        1,
+        'ea053b877ae763a41c5d3f6a4c3ee798c14cc4f55cb818b71ee9286de7da20ae',
+        'ec65bd436244f57a743897b66aa230f89ac5037fa11df043333917fa3bcaea6e'
+        '1183387acf13fd79dc9875c979c90c4193a3b54fe9b964a17d0ae12b12ce1bff1c',
+    ),
+]
+
+
+@pytest.mark.parametrize('message_type,chain_id,message_hash,signature', VECTORS)
+def test_vault_validators_hash(
+    message_type: str, chain_id: int, message_hash: str, signature: str
+) -> None:
+    validators_registry_root, validators = _get_message(message_type)
+    result = get_vault_validators_hash(chain_id, VAULT, validators_registry_root, validators)
+
+    assert result.hex() == message_hash
+    assert ACCOUNT.unsafe_sign_hash(result).signature == bytes.fromhex(signature)
+
+
+def test_sign_vault_validators() -> None:
+    validators_registry_root, validators = _get_message('register_v2')
+    message_hash = get_vault_validators_hash(
+        settings.network_config.CHAIN_ID, VAULT, validators_registry_root, validators
+    )
+    signature = sign_vault_validators(ACCOUNT, VAULT, validators_registry_root, validators)
+
+    assert Web3.to_bytes(hexstr=signature) == ACCOUNT.unsafe_sign_hash(message_hash).signature
+
+
+def test_vault_validators_hash_invalid_root() -> None:
+    with pytest.raises(ValueError):
+        get_vault_validators_hash(1, VAULT, bytes(31), b'')
+
+
+def _get_message(message_type: str) -> tuple[bytes, bytes]:
+    """Validators registry root, or the nonce, and validators payload of the message."""
+    validators = [
+        (_fill(i, 48), _fill(i + 1, 96), _fill(i + 2, 32), (i + 1) * 10**9 + i) for i in range(2)
+    ]
+    public_keys = [public_key for public_key, *_ in validators]
+    v1_validators = b''.join(pk + signature + root for pk, signature, root, _ in validators)
+    v2_validators = b''.join(
+        pk + signature + root + amount.to_bytes(8, 'big')
+        for pk, signature, root, amount in validators
+    )
+    messages = {
+        'register_v2': (_fill(200, 32), v2_validators),
+        'register_v1': (_fill(201, 32), v1_validators),
+        'fund': (_to_nonce(5), v2_validators),
+        'withdraw': (
+            _to_nonce(7),
+            b''.join(pk + amount.to_bytes(8, 'big') for pk, _, _, amount in validators),
+        ),
+        'consolidate': (
+            _to_nonce(9),
+            b''.join(source + target for source, target in zip(public_keys, public_keys[::-1])),
+        ),
+        'empty': (bytes(32), b''),
+    }
+    return messages[message_type]
+
+
+def _to_nonce(nonce: int) -> bytes:
+    return nonce.to_bytes(32, byteorder='big')
+
+
+def _fill(seed: int, length: int) -> bytes:
+    return bytes((seed + i) % 256 for i in range(length))
@@ -0,0 +1,137 @@
+import hashlib
+import secrets
+
+import pytest
+from eth_typing import BLSPubkey, BLSSignature
+from sw_utils.typings import Bytes32
+from web3.types import Gwei
+
+from src.validators.encoding import (
+    encode_consolidations,
+    encode_validators,
+    encode_withdrawals,
+)
+from src.validators.typings import Validator, ValidatorBatch, ValidatorType
+
+# sha256 of the payloads produced by the encoders of the baseline validators manager
+VALIDATORS_VECTORS = [
+    (ValidatorType.V1, 2, 352, '0b78f4193ee9796606f8aa2c351847b84a899c559855d05c4e03069af283add7'),
+    (
+        ValidatorType.V1,
+        100,
+        17600,
+        'd7bade7bf80b5540286a4cb433c54c437d5c938ec7051e80d49a530587e1ff5a',
+    ),
+    (ValidatorType.V2, 2, 368, '0cc19faed24f0d5634838516d8e2eaa7baf096ea4b0b4edddbf1835fab25e27b'),
+    (
+        ValidatorType.V2,
+        100,
+        18400,
+        'e1d2585134451e6370835156ff8238eb74a657fe6ae9bdd1c9965107a9d1733f',
+    ),
+]
+WITHDRAWALS_VECTORS = [
+    (2, 112, 'bd9bb4faa47b0c1dfc0ad49ae1743c6f26660d16774721dce621f512d451002a'),
+    (100, 5600, 'f25a36d026b1af5910885533dbba64e6a7fd73d319050a0a455debbc66704e9e'),
+]
+CONSOLIDATIONS_VECTORS = [
+    (2, 192, 'daff1f4190501d790412dbf0782bfaf633e533efc853fbc2cd7a2bda97d18f23'),
+    (100, 9600, 'a3ea4e2b55854e879b78d7f2889439d3c99b4261d3578a15695fb81bab3f9dfe'),
+]
+
+
+@pytest.mark.parametrize('validator_type,count,length,digest', VALIDATORS_VECTORS)
+def test_encode_validators(
+    validator_type: ValidatorType, count: int, length: int, digest: str
+) -> None:
+    validators = _get_validators(count, validator_type)
+    batch = _to_batch(validators, validator_type)
+
+    for encoded in (encode_validators(validators), encode_validators(batch)):
+        assert len(encoded) == length
+        assert hashlib.sha256(encoded).hexdigest() == digest
+
+
+@pytest.mark.parametrize('count,length,digest', WITHDRAWALS_VECTORS)
+def test_encode_withdrawals(count: int, length: int, digest: str) -> None:
+    validators = _get_validators(count, ValidatorType.V2)
+    encoded = encode_withdrawals([v.public_key for v in validators], [v.amount for v in validators])
+
+    assert len(encoded) == length
+    assert hashlib.sha256(encoded).hexdigest() == digest
+
+
+def test_encode_withdrawals_max_amount() -> None:
+    encoded = encode_withdrawals([_fill(7, 48)], [Gwei(2**64 - 1)])
+
+    assert encoded == _fill(7, 48) + b'\xff' * 8
+
+
+@pytest.mark.parametrize('count,length,digest', CONSOLIDATIONS_VECTORS)
+def test_encode_consolidations(count: int, length: int, digest: str) -> None:
+    public_keys = [v.public_key for v in _get_validators(count, ValidatorType.V2)]
+    encoded = encode_consolidations(public_keys, public_keys[::-1])
+
+    assert len(encoded) == length
+    assert hashlib.sha256(encoded).hexdigest() == digest
+
+
+@pytest.mark.parametrize('validator_type', list(ValidatorType))
+def test_encode_validator_batch_random(validator_type: ValidatorType) -> None:
+    validators = [
+        Validator(
+            public_key=BLSPubkey(secrets.token_bytes(48)),
+            deposit_data_root=Bytes32(secrets.token_bytes(32)),
+            deposit_signature=BLSSignature(secrets.token_bytes(96)),
+            amount=Gwei(secrets.randbelow(2**64)),
+            validator_type=validator_type,
+        )
+        for _ in range(50)
+    ]
+    expected = b''.join(_encode_validator_legacy(v) for v in validators)
+
+    assert encode_validators(validators) == expected
+    assert encode_validators(_to_batch(validators, validator_type)) == expected
+
+
+def test_encode_invalid_length() -> None:
+    with pytest.raises(ValueError):
+        encode_withdrawals([_fill(0, 47)], [Gwei(1)])
+    with pytest.raises(ValueError):
+        encode_consolidations([_fill(0, 48)], [_fill(0, 49)])
+
+
+def _get_validators(count: int, validator_type: ValidatorType) -> list[Validator]:
+    return [
+        Validator(
+            public_key=BLSPubkey(_fill(i, 48)),
+            deposit_signature=BLSSignature(_fill(i + 1, 96)),
+            deposit_data_root=Bytes32(_fill(i + 2, 32)),
+            amount=Gwei((i + 1) * 10**9 + i),
+            validator_type=validator_type,
+        )
+        for i in range(count)
+    ]
+
+
+def _to_batch(validators: list[Validator], validator_type: ValidatorType) -> ValidatorBatch:
+    batch = ValidatorBatch(validator_type)
+    for v in validators:
+        batch.append(
+            public_key=v.public_key,
+            deposit_signature=v.deposit_signature,
+            deposit_data_root=v.deposit_data_root,
+            amount=v.amount,
+        )
+    return batch
+
+
+def _encode_validator_legacy(v: Validator) -> bytes:
+    encoded = v.public_key + v.deposit_signature + v.deposit_data_root
+    if v.validator_type == ValidatorType.V2:
+        encoded += v.amount.to_bytes(8, byteorder='big')
+    return encoded
+
+
+def _fill(seed: int, length: int) -> bytes:
+    return bytes((seed + i) % 256 for i in range(length))
@@ -0,0 +1,68 @@
+import pytest
+from ssz import Serializable, bytes4, bytes32, uint64
+from sw_utils import get_exit_message_signing_root
+from sw_utils.signing import compute_deposit_domain
+
+from src.config.networks import NETWORKS
+from src.validators.signing import (
+    DOMAIN_DEPOSIT,
+    DOMAIN_VOLUNTARY_EXIT,
+    get_exit_signing_root,
+    get_signing_context,
+)
+
+VALIDATOR_INDEXES = [0, 1, 123456, 2**64 - 1]
+
+
+# containers of the consensus specs
+class ForkData(Serializable):
+    fields = [('current_version', bytes4), ('genesis_validators_root', bytes32)]
+
+
+class VoluntaryExit(Serializable):
+    fields = [('epoch', uint64), ('validator_index', uint64)]
+
+
+class SigningData(Serializable):
+    fields = [('object_root', bytes32), ('domain', bytes32)]
+
+
+@pytest.mark.parametrize('network', list(NETWORKS))
+def test_signing_context(network: str) -> None:
+    network_config = NETWORKS[network]
+    context = get_signing_context(network)
+
+    exit_fork_data = ForkData(
+        current_version=network_config.SHAPELLA_FORK.version,
+        genesis_validators_root=network_config.GENESIS_VALIDATORS_ROOT,
+    )
+    deposit_fork_data = ForkData(
+        current_version=network_config.GENESIS_FORK_VERSION,
+        genesis_validators_root=bytes(32),
+    )
+    assert context.exit_domain == DOMAIN_VOLUNTARY_EXIT + exit_fork_data.hash_tree_root[:28]
+    assert context.deposit_domain == DOMAIN_DEPOSIT + deposit_fork_data.hash_tree_root[:28]
+    assert context.deposit_domain == compute_deposit_domain(network_config.GENESIS_FORK_VERSION)
+    assert context.exit_epoch == network_config.SHAPELLA_FORK.epoch
+
+
+@pytest.mark.parametrize('network', list(NETWORKS))
+@pytest.mark.parametrize('validator_index', VALIDATOR_INDEXES)
+def test_exit_signing_root(network: str, validator_index: int) -> None:
+    network_config = NETWORKS[network]
+    context = get_signing_context(network)
+    voluntary_exit = VoluntaryExit(epoch=context.exit_epoch, validator_index=validator_index)
+    signing_data = SigningData(
+        object_root=voluntary_exit.hash_tree_root, domain=context.exit_domain
+    )
+
+    signing_root = get_exit_signing_root(context, validator_index)
+
+    assert signing_root == signing_data.hash_tree_root
+    assert signing_root == bytes(
+        get_exit_message_signing_root(
+            validator_index=validator_index,
+            genesis_validators_root=network_config.GENESIS_VALIDATORS_ROOT,
+            fork=network_config.SHAPELLA_FORK,
+        )
+    )
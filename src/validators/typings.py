@@ -1,20 +1,159 @@
+import sys
+from array import array
 from dataclasses import dataclass
 from enum import Enum
+from typing import Iterable, Sequence, overload
 
-from eth_typing import BLSSignature, HexStr
+from eth_typing import BLSPubkey, BLSSignature
+from sw_utils.typings import Bytes32
 from web3.types import Gwei
 
+PUBLIC_KEY_LENGTH = 48
+SIGNATURE_LENGTH = 96
+ROOT_LENGTH = 32
+
 
 class ValidatorType(Enum):
     V1 = '0x01'
     V2 = '0x02'
 
 
-@dataclass
+@dataclass(slots=True)
 class Validator:
-    public_key: HexStr
-    deposit_data_root: HexStr
-    deposit_signature: HexStr
+    public_key: BLSPubkey
+    deposit_data_root: Bytes32
+    deposit_signature: BLSSignature
     amount: Gwei
     validator_type: ValidatorType = ValidatorType.V2
     exit_signature: BLSSignature | None = None
+
+
+class ValidatorBatch(Sequence[Validator]):
+    """
+    Validators of one type stored in contiguous fixed-width buffers.
+    `Validator` items are created on access, so the batch is passed between processes,
+    concatenated and encoded without per-validator objects.
+    Exit signatures are stored either for all validators or for none of them.
+    """
+
+    def __init__(self, validator_type: ValidatorType = ValidatorType.V2) -> None:
+        self.validator_type = validator_type
+        self.public_keys = bytearray()
+        self.deposit_signatures = bytearray()
+        self.deposit_data_roots = bytearray()
+        self.exit_signatures = bytearray()
+        self.amounts = array('Q')
+
+    @property
+    def has_exit_signatures(self) -> bool:
+        return bool(self.exit_signatures)
+
+    # fields are passed separately, so no `Validator` is created per appended item
+    def append(  # pylint: disable=too-many-arguments
+        self,
+        public_key: bytes,
+        deposit_signature: bytes,
+        deposit_data_root: bytes,
+        amount: int,
+        exit_signature: bytes | None = None,
+    ) -> None:
+        check_length(public_key, PUBLIC_KEY_LENGTH)
+        check_length(deposit_signature, SIGNATURE_LENGTH)
+        check_length(deposit_data_root, ROOT_LENGTH)
+        if self.amounts and (exit_signature is not None) != self.has_exit_signatures:
+            raise ValueError('Exit signatures must be set for all validators of the batch')
+
+        self.public_keys += public_key
+        self.deposit_signatures += deposit_signature
+        self.deposit_data_roots += deposit_data_root
+        if exit_signature is not None:
+            check_length(exit_signature, SIGNATURE_LENGTH)
+            self.exit_signatures += exit_signature
+        self.amounts.append(amount)
+
+    def get_amounts_big_endian(self) -> bytes:
+        amounts = array('Q', self.amounts)
+        if sys.byteorder == 'little':
+            amounts.byteswap()
+        return amounts.tobytes()
+
+    @classmethod
+    def concat(cls, batches: Iterable['ValidatorBatch']) -> 'ValidatorBatch':
+        batches = list(batches)
+        result = cls(batches[0].validator_type if batches else ValidatorType.V2)
+        if any(b.validator_type != result.validator_type for b in batches):
+            raise ValueError('Validator types of the batches are different')
+        if len({b.has_exit_signatures for b in batches if b.amounts}) > 1:
+            raise ValueError('Exit signatures must be set for all validators of the batch')
+
+        result.public_keys = bytearray().join(b.public_keys for b in batches)
+        result.deposit_signatures = bytearray().join(b.deposit_signatures for b in batches)
+        result.deposit_data_roots = bytearray().join(b.deposit_data_roots for b in batches)
+        result.exit_signatures = bytearray().join(b.exit_signatures for b in batches)
+        for batch in batches:
+            result.amounts.extend(batch.amounts)
+        return result
+
+    def __len__(self) -> int:
+        return len(self.amounts)
+
+    @overload
+    def __getitem__(self, index: int) -> Validator:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> 'ValidatorBatch':
+        ...
+
+    def __getitem__(self, index: int | slice) -> 'Validator | ValidatorBatch':
+        if isinstance(index, slice):
+            return self._slice(index)
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('Validator index out of range')
+
+        exit_signature = None
+        if self.has_exit_signatures:
+            exit_signature = BLSSignature(_get_item(self.exit_signatures, index, SIGNATURE_LENGTH))
+        return Validator(
+            public_key=BLSPubkey(_get_item(self.public_keys, index, PUBLIC_KEY_LENGTH)),
+            deposit_data_root=Bytes32(_get_item(self.deposit_data_roots, index, ROOT_LENGTH)),
+            deposit_signature=BLSSignature(
+                _get_item(self.deposit_signatures, index, SIGNATURE_LENGTH)
+            ),
+            amount=Gwei(self.amounts[index]),
+            validator_type=self.validator_type,
+            exit_signature=exit_signature,
+        )
+
+    def _slice(self, index: slice) -> 'ValidatorBatch':
+        start, stop, step = index.indices(len(self))
+        if step != 1:
+            raise ValueError('Slice step is not supported')
+        stop = max(start, stop)
+
+        result = ValidatorBatch(self.validator_type)
+        result.public_keys = self.public_keys[start * PUBLIC_KEY_LENGTH : stop * PUBLIC_KEY_LENGTH]
+        result.deposit_signatures = self.deposit_signatures[
+            start * SIGNATURE_LENGTH : stop * SIGNATURE_LENGTH
+        ]
+        result.deposit_data_roots = self.deposit_data_roots[
+            start * ROOT_LENGTH : stop * ROOT_LENGTH
+        ]
+        result.exit_signatures = self.exit_signatures[
+            start * SIGNATURE_LENGTH : stop * SIGNATURE_LENGTH
+        ]
+        result.amounts = self.amounts[start:stop]
+        return result
+
+
+def _get_item(buffer: bytearray, index: int, length: int) -> bytes:
+    return bytes(buffer[index * length : (index + 1) * length])
+
+
+def check_length(value: bytes, length: int) -> None:
+    # struct pads or truncates values of the wrong length silently
+    if len(value) != length:
+        raise ValueError(f'Invalid value length: expected {length} bytes, got {len(value)}')
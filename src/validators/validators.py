@@ -1,60 +1,219 @@
-import milagro_bls_binding as bls
+import asyncio
+import itertools
+from typing import Any, AsyncIterator, Coroutine
+
 from eth_typing import BLSSignature, ChecksumAddress
-from sw_utils import ConsensusFork, get_exit_message_signing_root
-from web3 import Web3
 from web3.types import Gwei
 
+from src.common.executor import BatchScheduler
+from src.common.metrics import stage_timer
 from src.config import settings
-from src.validators.credentials import Credential, CredentialManager
-from src.validators.typings import Validator, ValidatorType
+from src.validators.bls_backends import get_bls_backend
+from src.validators.credentials import Credential, CredentialManager, ValidatorKeys
+from src.validators.key_pool import key_pool
+from src.validators.key_seed import get_seed_tree, key_index_allocator
+from src.validators.keystore_store import keystore_store
+from src.validators.signing import (
+    DepositDatum,
+    SigningContext,
+    build_deposit_datum,
+    get_exit_signing_root,
+    get_signing_context,
+)
+from src.validators.typings import ValidatorBatch, ValidatorType
+from src.validators.verification import verify_validators_async
 
 
-def generate_validators(
+async def generate_validators_async(
     vault_address: ChecksumAddress,
     start_index: int,
     amounts: list[Gwei],
     validator_type: ValidatorType,
-) -> list[Validator]:
+) -> ValidatorBatch:
     """
-    `_generate_validators` generates validator keystores, but does not save keystores on disk.
-    todo: You should save keystores on disk to be able to exit validator manually.
+    Splits the batch into chunks of `settings.crypto_chunk_size` validators
+    and generates them in crypto workers, so the event loop is not blocked.
+    Credentials are taken from the key pool when it is enabled.
     """
-    res = []
-    count = len(amounts)
-    credentials = CredentialManager.generate_credentials(
-        count=count,
-        start_index=0,
-        network=settings.network,
+    jobs = await _get_generate_validators_jobs(
         vault_address=vault_address,
+        start_index=start_index,
+        amounts=amounts,
         validator_type=validator_type,
     )
+    chunks = await asyncio.gather(*jobs)
+    return ValidatorBatch.concat(chunks)
+
+
+async def iter_validators_async(
+    vault_address: ChecksumAddress,
+    start_index: int,
+    amounts: list[Gwei],
+    validator_type: ValidatorType,
+) -> AsyncIterator[ValidatorBatch]:
+    """
+    Same as `generate_validators_async`, but yields chunks of validators in order.
+    Only a few chunks per crypto worker are generated ahead of the consumer.
+    """
+    jobs = iter(
+        await _get_generate_validators_jobs(
+            vault_address=vault_address,
+            start_index=start_index,
+            amounts=amounts,
+            validator_type=validator_type,
+        )
+    )
+    window = 2 * max(settings.crypto_workers, 1)
+    tasks = [asyncio.ensure_future(job) for job in itertools.islice(jobs, window)]
+    try:
+        while tasks:
+            validators = await tasks.pop(0)
+            tasks.extend(asyncio.ensure_future(job) for job in itertools.islice(jobs, 1))
+            yield validators
+    finally:
+        for task in tasks:
+            task.cancel()
+        for job in jobs:
+            job.close()
+
+
+async def _get_generate_validators_jobs(
+    vault_address: ChecksumAddress,
+    start_index: int,
+    amounts: list[Gwei],
+    validator_type: ValidatorType,
+) -> list[Coroutine[Any, Any, ValidatorBatch]]:
+    chunk_size = settings.crypto_chunk_size
+    credentials = key_pool.take(vault_address, validator_type, len(amounts))
+
+    # keys missing in the pool are derived from the mnemonic at allocated indexes
+    key_start_index = None
+    if key_index_allocator.enabled and len(credentials) < len(amounts):
+        key_start_index = await key_index_allocator.allocate(
+            count=len(amounts) - len(credentials),
+            vault=vault_address,
+            validators_start_index=start_index + len(credentials),
+        )
+
+    jobs = []
+    for offset in range(0, len(amounts), chunk_size):
+        chunk_key_start_index = None
+        if key_start_index is not None:
+            chunk_key_start_index = key_start_index + max(offset - len(credentials), 0)
+        jobs.append(
+            _generate_validators_chunk(
+                vault_address=vault_address,
+                start_index=start_index + offset,
+                amounts=amounts[offset : offset + chunk_size],
+                validator_type=validator_type,
+                keys=ValidatorKeys(
+                    credentials=credentials[offset : offset + chunk_size],
+                    start_index=chunk_key_start_index,
+                ),
+            )
+        )
+    return jobs
+
+
+async def _generate_validators_chunk(
+    vault_address: ChecksumAddress,
+    start_index: int,
+    amounts: list[Gwei],
+    validator_type: ValidatorType,
+    keys: ValidatorKeys,
+) -> ValidatorBatch:
+    with stage_timer('generate_validators'):
+        validators, credentials = await generate_validators_scheduler.run(
+            len(amounts),
+            vault_address=vault_address,
+            start_index=start_index,
+            amounts=amounts,
+            validator_type=validator_type,
+            keys=keys,
+        )
+    # keystores are encrypted in the background, waits while the keystore queue is full
+    await keystore_store.save(credentials)
+    if settings.verify_signatures:
+        await verify_validators_async(vault_address, start_index, validators)
+    return validators
+
+
+def generate_validators(
+    vault_address: ChecksumAddress,
+    start_index: int,
+    amounts: list[Gwei],
+    validator_type: ValidatorType,
+    keys: ValidatorKeys | None = None,
+) -> ValidatorBatch:
+    return generate_validators_with_credentials(
+        vault_address=vault_address,
+        start_index=start_index,
+        amounts=amounts,
+        validator_type=validator_type,
+        keys=keys,
+    )[0]
+
+
+def generate_validators_with_credentials(
+    vault_address: ChecksumAddress,
+    start_index: int,
+    amounts: list[Gwei],
+    validator_type: ValidatorType,
+    keys: ValidatorKeys | None = None,
+) -> tuple[ValidatorBatch, list[Credential]]:
+    """
+    Generates validators and returns them with their credentials,
+    which are saved by the keystore store when it is enabled.
+    Keys are generated from random root keys unless `keys` are passed.
+    """
+    keys = keys or ValidatorKeys()
+    res = ValidatorBatch(validator_type)
+    count = len(amounts)
+    credentials = list(keys.credentials)
+    if len(credentials) < count:
+        credentials += CredentialManager.generate_credentials(
+            count=count - len(credentials),
+            start_index=0 if keys.start_index is None else keys.start_index,
+            vault_address=vault_address,
+            validator_type=validator_type,
+            tree=None if keys.start_index is None else get_seed_tree(),
+        )
     validator_indexes = range(start_index, start_index + count)
+    context = get_signing_context(settings.network)
 
     for validator_index, amount, credential in zip(validator_indexes, amounts, credentials):
-        deposit_datum_dict = credential.get_deposit_datum_dict(amount)
-        exit_signature = _get_exit_signature(validator_index=validator_index, credential=credential)
+        deposit_datum = _get_deposit_datum(context, credential, amount)
+        exit_signature = _get_exit_signature(context, validator_index, credential)
         res.append(
-            Validator(
-                public_key=credential.public_key,
-                deposit_data_root=Web3.to_hex(deposit_datum_dict['deposit_data_root']),
-                deposit_signature=Web3.to_hex(deposit_datum_dict['signature']),
-                amount=amount,
-                exit_signature=exit_signature,
-                validator_type=validator_type,
-            )
+            public_key=credential.public_key,
+            deposit_signature=deposit_datum.signature,
+            deposit_data_root=deposit_datum.deposit_data_root,
+            amount=amount,
+            exit_signature=exit_signature,
         )
-    return res
+    return res, credentials[:count]
 
 
+@stage_timer('deposit_signing')
+def _get_deposit_datum(
+    context: SigningContext, credential: Credential, amount: int
+) -> DepositDatum:
+    return build_deposit_datum(
+        context=context,
+        private_key=credential.private_key,
+        public_key=credential.public_key,
+        withdrawal_credentials=credential.withdrawal_credentials,
+        amount=amount,
+    )
+
+
+@stage_timer('exit_signing')
 def _get_exit_signature(
-    validator_index: int, credential: Credential, fork: ConsensusFork | None = None
+    context: SigningContext, validator_index: int, credential: Credential
 ) -> BLSSignature:
-    fork = fork or settings.network_config.SHAPELLA_FORK
+    message = get_exit_signing_root(context, validator_index)
+    return get_bls_backend().sign(credential.private_key, message)
 
-    message = get_exit_message_signing_root(
-        validator_index=validator_index,
-        genesis_validators_root=settings.network_config.GENESIS_VALIDATORS_ROOT,
-        fork=fork,
-    )
 
-    return bls.Sign(Web3.to_bytes(credential.private_key), message)
+# small chunks of concurrent requests are generated in one crypto job
+generate_validators_scheduler = BatchScheduler(generate_validators_with_credentials)
@@ -0,0 +1,99 @@
+from typing import NoReturn, Sequence
+
+from eth_typing import ChecksumAddress
+from sw_utils import get_v1_withdrawal_credentials, get_v2_withdrawal_credentials
+
+from src.common.executor import crypto_executor
+from src.common.metrics import stage_timer, verified_validators
+from src.config import settings
+from src.validators.bls_backends import get_bls_backend
+from src.validators.signing import (
+    get_deposit_signing_root,
+    get_exit_signing_root,
+    get_signing_context,
+)
+from src.validators.typings import Validator, ValidatorType
+
+
+class InvalidSignatureError(Exception):
+    pass
+
+
+async def verify_validators_async(
+    vault_address: ChecksumAddress, start_index: int, validators: Sequence[Validator]
+) -> None:
+    """Verifies deposit and exit signatures of the batch in crypto workers."""
+    with stage_timer('verify_signatures'):
+        await crypto_executor.run(
+            verify_validators,
+            vault_address=vault_address,
+            start_index=start_index,
+            validators=validators,
+        )
+    verified_validators.inc(len(validators))
+
+
+def verify_validators(
+    vault_address: ChecksumAddress, start_index: int, validators: Sequence[Validator]
+) -> None:
+    """
+    Checks all deposit and exit signatures with a single aggregate verification.
+    Signing roots are distinct, so one pairing check covers the whole batch.
+
+    The aggregate is not randomized: it takes about half the time of individual checks,
+    but errors of two signatures cancelling out in the sum are not detected.
+    Signatures are produced by the relayer itself, so the check guards against faults
+    like a wrong key or domain rather than crafted signatures.
+    When the aggregate check fails, signatures are verified one by one to find the invalid one.
+    """
+    if not validators:
+        return
+
+    context = get_signing_context(settings.network)
+    public_keys, messages, signatures = [], [], []
+    for validator_index, validator in enumerate(validators, start=start_index):
+        if validator.exit_signature is None:
+            raise InvalidSignatureError(f'Missing exit signature: {validator.public_key.hex()}')
+
+        withdrawal_credentials = _get_withdrawal_credentials(
+            vault_address, validator.validator_type
+        )
+        public_keys.append(validator.public_key)
+        messages.append(
+            get_deposit_signing_root(
+                context, validator.public_key, withdrawal_credentials, validator.amount
+            )
+        )
+        signatures.append(validator.deposit_signature)
+
+        public_keys.append(validator.public_key)
+        messages.append(get_exit_signing_root(context, validator_index))
+        signatures.append(validator.exit_signature)
+
+    bls_backend = get_bls_backend()
+    aggregate_signature = bls_backend.aggregate(signatures)
+    if not bls_backend.aggregate_verify(public_keys, messages, aggregate_signature):
+        _raise_invalid_signature(start_index, public_keys, messages, signatures)
+
+
+def _raise_invalid_signature(
+    start_index: int, public_keys: list[bytes], messages: list[bytes], signatures: list[bytes]
+) -> NoReturn:
+    # every validator has a deposit and an exit signature
+    bls_backend = get_bls_backend()
+    for index, (public_key, message, signature) in enumerate(
+        zip(public_keys, messages, signatures)
+    ):
+        if not bls_backend.verify(public_key, message, signature):
+            kind = 'exit' if index % 2 else 'deposit'
+            raise InvalidSignatureError(
+                f'Invalid {kind} signature of validator {start_index + index // 2}'
+            )
+    end_index = start_index + len(signatures) // 2 - 1
+    raise InvalidSignatureError(f'Invalid signatures for validators {start_index}-{end_index}')
+
+
+def _get_withdrawal_credentials(vault: ChecksumAddress, validator_type: ValidatorType) -> bytes:
+    if validator_type == ValidatorType.V1:
+        return get_v1_withdrawal_credentials(vault)
+    return get_v2_withdrawal_credentials(vault)
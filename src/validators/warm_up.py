@@ -0,0 +1,46 @@
+import logging
+import time
+
+from eth_typing import ChecksumAddress
+from web3.constants import ADDRESS_ZERO
+from web3.types import Gwei
+
+from src.common.clients import get_execution_clients
+from src.common.contracts import (
+    ValidatorsRegistryContract,
+    VaultContract,
+    get_contract_factory,
+    validators_registry_contract,
+)
+from src.common.executor import crypto_executor
+from src.validators.typings import ValidatorType
+from src.validators.validators import generate_validators
+
+logger = logging.getLogger(__name__)
+
+WARM_UP_AMOUNT = Gwei(32 * 10**9)
+
+
+async def warm_up() -> None:
+    """
+    Pays first-use costs before the app reports ready:
+    contract objects in this process, key derivation and BLS signing in crypto workers.
+    """
+    start = time.perf_counter()
+    _ = validators_registry_contract.contract
+    _ = VaultContract(ChecksumAddress(ADDRESS_ZERO)).contract
+    # reads use contract objects of the selected endpoint
+    for endpoint in get_execution_clients().endpoints:
+        for abi_path in (ValidatorsRegistryContract.abi_path, VaultContract.abi_path):
+            get_contract_factory(abi_path, endpoint.client)
+    await crypto_executor.warm_up(warm_up_crypto)
+    logger.info('warm-up completed in %.2fs', time.perf_counter() - start)
+
+
+def warm_up_crypto() -> None:
+    generate_validators(
+        vault_address=ChecksumAddress(ADDRESS_ZERO),
+        start_index=0,
+        amounts=[WARM_UP_AMOUNT],
+        validator_type=ValidatorType.V2,
+    )